@@ -0,0 +1,47 @@
+"""
+Streamlit Apps hub: one multipage entry point for all four tools.
+
+    streamlit run app.py
+
+Each page imports its tool module only when it is first opened, and heavy
+resources (the NovaLearn model, the solved Tic-Tac-Toe table, the task
+store) are cached with `st.cache_resource`, so a single server process
+serves every tool.
+"""
+
+import streamlit as st
+
+
+# ---------------- Pages ---------------- #
+# Imports live inside each page so a tool's dependencies are only loaded
+# once somebody opens it.
+def calculator_page():
+    from calculator import calculator
+    calculator()
+
+
+def todo_page():
+    from to_do_list import todo_list
+    todo_list()
+
+
+def tic_tac_toe_page():
+    from tic_tac_toe import tic_tac_toe
+    tic_tac_toe()
+
+
+def novalearn_page():
+    from NovaLearnAI import novalearn_app
+    novalearn_app()
+
+
+PAGES = [
+    st.Page(calculator_page, title="Calculator", icon="🧮", url_path="calculator", default=True),
+    st.Page(todo_page, title="To-Do List", icon="📝", url_path="todo"),
+    st.Page(tic_tac_toe_page, title="Tic-Tac-Toe", icon="⭕", url_path="tic-tac-toe"),
+    st.Page(novalearn_page, title="NovaLearn AI+", icon="🚀", url_path="novalearn"),
+]
+
+if __name__ == "__main__":
+    st.set_page_config(page_title="Streamlit Apps", page_icon="🎮")
+    st.navigation(PAGES).run()
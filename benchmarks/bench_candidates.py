@@ -0,0 +1,120 @@
+"""
+Benchmark: single-pass candidate extraction vs. the per-sentence regex helpers.
+
+Compares, on a synthetic syllabus of `--pages` pages:
+  * old: clean_text_for_sentences + pick_answer_candidates for every sentence
+  * new: one streaming pass of iter_candidates over the prepared text
+and the previous build_prompts against the current one. It reports CPU
+time (best of --repeat), the peak traced allocation (tracemalloc) and the
+number of allocated blocks still held when the call returns
+(sys.getallocatedblocks delta). Python has no counter of total allocations,
+so peak bytes is the proxy for transient churn. It also checks that the
+first candidate per sentence is identical.
+
+Run from the repository root:
+    python -m benchmarks.bench_candidates --pages 1000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from novalearn_core import (
+    build_prompts, clean_text_for_sentences, iter_candidates, pick_answer_candidates,
+    prepare_text, scan_sentences,
+)
+
+NOUNS = ("membrane protein enzyme genome tissue neuron signal pathway molecule reaction "
+         "structure function transport diffusion gradient receptor hormone").split()
+NAMES = ["Krebs Cycle", "Golgi Apparatus", "Central Dogma of Biology", "Mendel", "Darwin",
+         "Cell Theory", "Electron Transport Chain", "Watson and Crick"]
+WORDS_PER_PAGE = 450
+
+
+def synthetic_document(pages, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(pages * WORDS_PER_PAGE // 12):
+        words = [rng.choice(NOUNS) for _ in range(rng.randint(6, 14))]
+        words.insert(rng.randrange(len(words)), rng.choice(["is", "the", "and", "of", "with"]))
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(len(words)), rng.choice(NAMES))
+        sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+        if rng.random() < 0.05:
+            sentences.append(f"\nPage {rng.randint(1, pages)}\n")
+    return " ".join(sentences)
+
+
+# The helpers as they were before the single-pass tokenizer.
+def old_candidates(text, max_k):
+    return [pick_answer_candidates(s, max_k=max_k) for s in clean_text_for_sentences(text)]
+
+
+def old_build_prompts(text, num_q):
+    sents = clean_text_for_sentences(text)
+    if not sents:
+        raise ValueError("No meaningful sentences found.")
+    prompts = []
+    for sent in sents[:min(int(num_q), len(sents), 25)]:
+        ans = pick_answer_candidates(sent, max_k=1)[0]
+        if ans.lower() not in sent.lower():
+            continue
+        prompts.append((ans, f"generate question: context: {sent.replace(ans, f'<hl> {ans} <hl>')}"))
+    return prompts
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    gc.collect()
+    before = sys.getallocatedblocks()
+    result = fn()  # Kept alive so its blocks are counted
+    blocks = sys.getallocatedblocks() - before
+    del result
+    return best, peak, blocks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    text = prepare_text(synthetic_document(args.pages))
+    old_first = [c[0] for c in old_candidates(text, 1)]
+    new_first = [c[0][0] if c else "concept" for _, _, c in scan_sentences(text, max_k=1)]
+    same = sum(a == b for a, b in zip(old_first, new_first))
+    print(f"{args.pages} pages, {len(text) / 2**20:.1f} MB of text, {len(old_first)} sentences; "
+          f"first candidate identical for {same}/{len(old_first)} sentences\n")
+
+    rows = []
+    for k in (1, 2):
+        rows += [
+            (f"old: per-sentence helpers, max_k={k}", lambda k=k: old_candidates(text, k)),
+            (f"new: iter_candidates stream, max_k={k}", lambda k=k: deque(iter_candidates(text, k), maxlen=0)),
+        ]
+    rows += [
+        ("old: build_prompts(num_q=25)", lambda: old_build_prompts(text, 25)),
+        ("new: build_prompts(num_q=25)", lambda: build_prompts(text, 25)),
+    ]
+
+    width = max(len(label) for label, _ in rows)
+    print(f"{'benchmark':<{width}}  {'CPU ms':>10}  {'peak alloc MB':>14}  {'blocks held':>12}")
+    for label, fn in rows:
+        cpu, peak, blocks = measure(fn, args.repeat)
+        print(f"{label:<{width}}  {cpu * 1000:>10.1f}  {peak / 2**20:>14.2f}  {blocks:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: expression engine vs. the calculator's scalar float path.
+
+Run from the repository root:
+    python -m benchmarks.bench_expression
+"""
+
+import argparse
+import timeit
+
+from calculator import calculate
+from expression_engine import compile_expression, evaluate
+
+SIMPLE = "a + b"
+COMPLEX = "(a + b) * sqrt(abs(a - b)) / (1 + b ** 2) - max(a, b) % 7"
+
+
+def rate(stmt, number):
+    seconds = min(timeit.repeat(stmt, number=number, repeat=3))
+    return number / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=100_000, help="calls per measurement")
+    args = parser.parse_args(argv)
+    n = args.number
+    env = {"a": 12.5, "b": 3.25}
+    uncached = compile_expression.__wrapped__
+
+    rows = [
+        ("float path: calculate(a, b, 'Add')", rate(lambda: calculate("12.5", "3.25", "Add"), n)),
+    ]
+    for label, expr in (("simple", SIMPLE), ("complex", COMPLEX)):
+        fn = compile_expression(expr)
+        rows += [
+            (f"{label}: parse + compile (no cache)", rate(lambda: uncached(expr), n // 10)),
+            (f"{label}: evaluate, cache hit", rate(lambda: evaluate(expr, env), n)),
+            (f"{label}: pre-compiled call", rate(lambda: fn(env), n)),
+            (f"{label}: evaluate, decimal", rate(lambda: evaluate(expr, env, "decimal"), n // 10)),
+            (f"{label}: evaluate, fraction", rate(lambda: evaluate(expr, env, "fraction"), n // 10)),
+        ]
+
+    width = max(len(label) for label, _ in rows)
+    print(f"{'benchmark':<{width}}  {'ops/sec':>12}")
+    for label, ops in rows:
+        print(f"{label:<{width}}  {ops:>12,.0f}")
+    info = compile_expression.cache_info()
+    print(f"\nLRU cache: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
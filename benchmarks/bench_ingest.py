@@ -0,0 +1,174 @@
+"""
+Throughput benchmark for streaming syllabus ingestion, per format.
+
+Builds a synthetic syllabus (headed sections, with some repeated
+boilerplate paragraphs) as TXT, Markdown, HTML, DOCX and PDF, then measures
+extraction alone and extraction + sentence indexing, plus the peak Python
+memory (tracemalloc) of the extraction pass.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingest --sections 400
+"""
+
+import argparse
+import io
+import random
+import time
+import tracemalloc
+import zipfile
+from html import escape
+
+from syllabus_ingest import (
+    DOCX, EXTRACTORS, HTML, MARKDOWN, PDF, TEXT, ingest, iter_blocks,
+)
+
+WORDS = ("cell membrane protein energy enzyme genome tissue neuron signal pathway "
+         "molecule reaction structure function transport diffusion gradient").split()
+BOILERPLATE = "Please review the course policies on the learning portal before the next lecture session."
+
+
+def synthetic_syllabus(sections, paragraphs=6, seed=0):
+    """[(heading, [paragraph, ...])] with a repeated boilerplate paragraph per section."""
+    rng = random.Random(seed)
+    doc = []
+    for i in range(1, sections + 1):
+        paras = [
+            " ".join(
+                f"The {rng.choice(WORDS)} {rng.choice(WORDS)} controls {' '.join(rng.choices(WORDS, k=6))}."
+                for _ in range(5)
+            )
+            for _ in range(paragraphs)
+        ]
+        doc.append((f"Unit {i}: {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}", paras + [BOILERPLATE]))
+    return doc
+
+
+# -------------------------- FORMATTERS -------------------------- #
+def as_text(doc):
+    return "\n\n".join(f"{h}\n\n" + "\n\n".join(paras) for h, paras in doc).encode()
+
+
+def as_markdown(doc):
+    return "\n\n".join(
+        f"## {h}\n\n" + "\n\n".join(f"- **Key idea:** {p}" if j % 3 == 0 else p for j, p in enumerate(paras))
+        for h, paras in doc
+    ).encode()
+
+
+def as_html(doc):
+    body = "".join(
+        f"<h2>{escape(h)}</h2>" + "".join(f"<p>{escape(p)}</p>" for p in paras) for h, paras in doc
+    )
+    return f"<html><head><title>Syllabus</title><style>p {{margin: 0}}</style></head><body>{body}</body></html>".encode()
+
+
+def as_docx(doc):
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+    def para(text, style=None):
+        ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        return f"<w:p>{ppr}<w:r><w:t>{escape(text)}</w:t></w:r></w:p>"
+
+    body = "".join(para(h, "Heading1") + "".join(para(p) for p in paras) for h, paras in doc)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-'
+                   'officedocument.wordprocessingml.document.main+xml"/></Types>')
+        z.writestr("word/document.xml", f'<?xml version="1.0"?><w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+    return buf.getvalue()
+
+
+def as_pdf(doc):
+    """One page per section: the heading at 18pt, the body wrapped at 11pt."""
+    def pdf_str(s):
+        return "(" + s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for heading, paras in doc:
+        lines, line = [], ""
+        for word in " ".join(paras).split():
+            if len(line) + len(word) > 95:
+                lines.append(line)
+                line = ""
+            line = f"{line} {word}".strip()
+        lines.append(line)
+        ops = [f"BT /F1 18 Tf 50 800 Td {pdf_str(heading)} Tj ET", "BT /F1 11 Tf 50 770 Td 13 TL"]
+        ops += [f"{pdf_str(ln)} '" for ln in lines[:55]] + ["ET"]
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{k} 0 R" for k in kids).encode(), len(kids))
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+FORMATS = [
+    ("txt", TEXT, as_text),
+    ("md", MARKDOWN, as_markdown),
+    ("html", HTML, as_html),
+    ("docx", DOCX, as_docx),
+    ("pdf", PDF, as_pdf),
+]
+
+
+# --------------------------- MEASURING -------------------------- #
+def extract_all(data, mime):
+    stats = {}
+    chars = sum(len(b) for b in iter_blocks(io.BytesIO(data), mime, stats))
+    return chars, stats
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=400, help="sections (PDF pages) in the synthetic syllabus")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--formats", nargs="+", choices=[f for f, _, _ in FORMATS], default=[f for f, _, _ in FORMATS])
+    args = parser.parse_args(argv)
+    doc = synthetic_syllabus(args.sections)
+
+    header = (f"{'format':<6} {'input MB':>9} {'extract MB/s':>13} {'blocks':>8} {'dupes':>6} "
+              f"{'ingest MB/s':>12} {'sections':>9} {'sentences':>10} {'peak MB':>8}")
+    print(header)
+    print("-" * len(header))
+    for name, mime, build in FORMATS:
+        if name not in args.formats:
+            continue
+        assert mime in EXTRACTORS
+        data = build(doc)
+        mb = len(data) / 2**20
+        extract_s, (_, stats) = timed(lambda: extract_all(data, mime), args.repeat)
+        ingest_s, (_, index, _) = timed(lambda: ingest(io.BytesIO(data), name=f"syllabus.{name}"), args.repeat)
+
+        tracemalloc.start()
+        extract_all(data, mime)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+        print(f"{name:<6} {mb:>9.2f} {mb / extract_s:>13.2f} {stats['blocks']:>8} {stats['duplicates']:>6} "
+              f"{mb / ingest_s:>12.2f} {index['topic'].nunique():>9} {len(index):>10} {peak:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Load test for the Streamlit apps using scripted AppTest sessions.
+
+Seeds a workspace with tasks.json, leaderboard.json and the novalearn CSVs at
+a configurable scale, then runs many simulated users in parallel processes.
+Each user drives one app through a scripted session (adding and completing
+tasks, playing games, taking quizzes) after one untimed warm-up session. The
+report gives per-rerun latency percentiles, file I/O per rerun and memory
+growth per app, all measured after the warm-up.
+
+Run from the repository root:
+    python -m benchmarks.loadtest --users 8 --tasks 5000 --questions 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.stats import percentile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = {
+    "calculator": "calculator.py",
+    "todo": "to_do_list.py",
+    "tic_tac_toe": "tic_tac_toe.py",
+    "novalearn": "NovaLearnAI.py",
+}
+TIMEOUT = 120
+
+
+# ---------------------------- FIXTURES -------------------------- #
+def seed_workspace(path, tasks=1000, players=100, questions=2000, results=5000, seed=0):
+    """Write state files at the requested scale into `path`."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    os.makedirs(os.path.join(path, "novalearn_data"), exist_ok=True)
+    # The To-Do app only imports tasks.json into a fresh database.
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(os.path.join(path, "tasks.db" + suffix))
+        except FileNotFoundError:
+            pass
+
+    with open(os.path.join(path, "tasks.json"), "w") as f:
+        json.dump([{
+            "task": f"Task {i}",
+            "due": (now + timedelta(hours=rng.randint(-240, 720))).strftime("%Y-%m-%d %H:%M"),
+            "status": "completed" if rng.random() < 0.3 else "pending",
+        } for i in range(tasks)], f)
+
+    with open(os.path.join(path, "leaderboard.json"), "w") as f:
+        json.dump({f"Player {i}": {"Wins": rng.randint(0, 50), "Losses": rng.randint(0, 50),
+                                   "Ties": rng.randint(0, 50)} for i in range(players)}, f, indent=4)
+
+    topics = [f"Topic {i}" for i in range(10)]
+    ts = now.strftime("%Y-%m-%d %H:%M")
+    with open(os.path.join(path, "novalearn_data", "generated_questions.csv"), "w") as f:
+        f.write("id,timestamp,topic,qtype,question,options,answer\n")
+        for i in range(1, questions + 1):
+            if i % 2:
+                f.write(f"{i},{ts},{rng.choice(topics)},MCQ,What is item {i}?,Alpha|Beta|Gamma|Delta,Alpha\n")
+            else:
+                f.write(f"{i},{ts},{rng.choice(topics)},Short Answer,Who is person {i}?,,Person {i}\n")
+    with open(os.path.join(path, "novalearn_data", "quiz_results.csv"), "w") as f:
+        f.write("timestamp,topic,qtype,question,correct,user_answer,correct_answer\n")
+        for i in range(results):
+            f.write(f"{ts},{rng.choice(topics)},MCQ,What is item {i}?,{rng.randint(0, 1)},Alpha,Alpha\n")
+    with open(os.path.join(path, "novalearn_data", "syllabus_text.txt"), "w") as f:
+        f.write(" ".join(f"Sentence number {i} explains an important idea about the course material." for i in range(500)))
+
+
+# ---------------------------- SESSIONS -------------------------- #
+def session_calculator(run, at):
+    run(at)
+    for a, b, op in [("3", "4", "Add"), ("10", "0", "Divide"), ("2.5", "8", "Multiply")]:
+        at.text_input[0].input(a)
+        at.text_input[1].input(b)
+        at.radio[1].set_value(op)
+        run(at.button[0].click())
+    at.radio[0].set_value("Expression")
+    run(at)
+    at.text_input[0].input("(x + 1) ** 2 / 3")
+    at.text_input[1].input("x=4")
+    run(at.button[0].click())
+
+
+def session_todo(run, at, rng):
+    run(at)
+    at.text_input[0].input(f"Load test task {rng.random():.6f}")
+    run(at.button[0].click())
+    for window in ["Overdue", "Today", "All"]:
+        at.radio(key="pending_window").set_value(window)
+        run(at)
+    for prefix in ["done_", "snooze_day_"]:
+        keys = [b.key for b in at.button if b.key and b.key.startswith(prefix)]
+        if keys:
+            run(at.button(key=keys[0]).click())
+
+
+def session_tic_tac_toe(run, at, rng):
+    run(at)
+    at.radio[0].set_value("Play vs Computer")
+    run(at)
+    for _ in range(5):
+        free = [b.key for b in at.button if b.key and len(b.key) == 2 and b.label == "-"]
+        if not free or any("Wins" in s.value or "Tie" in s.value for s in at.success):
+            break
+        run(at.button(key=rng.choice(free)).click())
+
+
+def session_novalearn(run, at):
+    run(at)
+    for page in ["📝 Take Quiz", "📈 Progress & Insights", "📄 Upload Syllabus"]:
+        at.sidebar.radio[0].set_value(page)
+        run(at)
+        if page == "📝 Take Quiz":
+            run(at.button[0].click())
+
+
+# ---------------------------- MEASURING ------------------------- #
+def io_counters():
+    """(bytes read, bytes written) by this process, from /proc where available."""
+    try:
+        with open("/proc/self/io") as f:
+            stats = dict(line.split(": ") for line in f.read().splitlines())
+        return int(stats["rchar"]), int(stats["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def simulate_user(args):
+    """Run scripted sessions in a worker process and return their measurements.
+
+    One untimed warm-up session runs first, so Streamlit and the app modules
+    are imported before anything is counted. After that, latency and file I/O
+    are recorded per rerun, and memory growth is measured across the timed
+    sessions. The first run of every AppTest also reads installed package
+    metadata (about 2.6 MB here). That read is measured once with an empty
+    script and subtracted, so "KB read/run" counts the app's own I/O.
+    """
+    app, workspace, user_id, sessions = args
+    os.chdir(workspace)
+    sys.path.insert(0, REPO_DIR)
+    rng = random.Random(user_id)
+    latencies = []
+    totals = {"read": 0, "written": 0, "recording": False, "first": True, "harness": 0}
+
+    def run(target):
+        # `target` is the AppTest or a widget that was just changed; both
+        # rerun the script and return the AppTest.
+        read0, write0 = io_counters()
+        start = time.perf_counter()
+        at = target.run(timeout=TIMEOUT)
+        elapsed = time.perf_counter() - start
+        read1, write1 = io_counters()
+        read = read1 - read0
+        if totals["first"]:
+            read = max(0, read - totals["harness"])
+            totals["first"] = False
+        if totals["recording"]:
+            latencies.append(elapsed)
+            totals["read"] += read
+            totals["written"] += write1 - write0
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    errors = []
+    mem0 = None
+    for session in range(sessions + 1):
+        if session == 1:
+            read0, _ = io_counters()
+            AppTest.from_string("import streamlit as st").run(timeout=TIMEOUT)
+            totals["harness"] = io_counters()[0] - read0
+            totals["recording"] = True
+            mem0 = rss_mb()
+        totals["first"] = True
+        at = AppTest.from_file(os.path.join(REPO_DIR, APPS[app]), default_timeout=TIMEOUT)
+        try:
+            if app == "todo":
+                session_todo(run, at, rng)
+            elif app == "tic_tac_toe":
+                session_tic_tac_toe(run, at, rng)
+            elif app == "novalearn":
+                session_novalearn(run, at)
+            else:
+                session_calculator(run, at)
+        except Exception as e:
+            errors.append(f"{'warm-up ' if not session else ''}{type(e).__name__}: {e}")
+    return {
+        "app": app,
+        "latencies": latencies,
+        "read": totals["read"],
+        "written": totals["written"],
+        "mem_start": mem0 if mem0 is not None else rss_mb(),
+        "mem_end": rss_mb(),
+        "errors": errors,
+    }
+
+
+# ---------------------------- REPORTING ------------------------- #
+def report(results):
+    by_app = defaultdict(list)
+    for r in results:
+        by_app[r["app"]].append(r)
+    header = f"{'app':<12} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'KB read/run':>12} {'KB written/run':>15} {'mem +MB':>8} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    for app, runs in by_app.items():
+        lat = sorted(x for r in runs for x in r["latencies"])
+        n = len(lat) or 1
+        read = sum(r["read"] for r in runs) / n / 1024
+        written = sum(r["written"] for r in runs) / n / 1024
+        growth = sum(r["mem_end"] - r["mem_start"] for r in runs) / len(runs)
+        errors = sum(len(r["errors"]) for r in runs)
+        print(f"{app:<12} {len(lat):>7} {percentile(lat, 50) * 1000:>8.1f} {percentile(lat, 90) * 1000:>8.1f} "
+              f"{percentile(lat, 99) * 1000:>8.1f} {read:>12.1f} {written:>15.1f} {growth:>8.1f} {errors:>7}")
+    for r in results:
+        for e in r["errors"][:3]:
+            print(f"  ! {r['app']}: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scripted-session load test for the Streamlit apps")
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--users", type=int, default=4, help="simulated users per app")
+    parser.add_argument("--sessions", type=int, default=2, help="sessions per user")
+    parser.add_argument("--workers", type=int, default=None, help="parallel processes")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--workspace", help="directory to seed (default: a temporary one)")
+    args = parser.parse_args(argv)
+
+    workspace = args.workspace or tempfile.mkdtemp(prefix="loadtest_")
+    seed_workspace(workspace, args.tasks, args.players, args.questions, args.results)
+    print(f"Seeded {workspace}: {args.tasks} tasks, {args.players} players, "
+          f"{args.questions} questions, {args.results} quiz results")
+
+    # AppTest swaps sys.modules["__main__"] in the workers, so hand them the
+    # worker function through its importable module name, not __main__.
+    from benchmarks.loadtest import simulate_user as worker
+
+    jobs = [(app, workspace, u, args.sessions) for app in args.apps for u in range(args.users)]
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(worker, jobs))
+    finally:
+        if not args.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+    print(f"{len(jobs)} simulated users finished in {time.perf_counter() - start:.1f}s\n")
+    report(results)
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
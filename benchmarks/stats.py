@@ -0,0 +1,11 @@
+"""Small statistics helpers shared by the benchmark scripts."""
+
+
+def percentile(sorted_values, pct):
+    """Linearly interpolated `pct`-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
@@ -1,9 +1,166 @@
+import io
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+from expression_engine import MODES, ExpressionError, compile_expression, evaluate, variable_names
+
+OPERATIONS = {
+    "Add": np.add,
+    "Subtract": np.subtract,
+    "Multiply": np.multiply,
+    "Divide": np.divide,
+}
+CHUNK_ROWS = 250_000
+
+# ---------------- Single Calculation ---------------- #
+def calculate(a, b, operation):
+    """Scalar float path; raises ValueError or ZeroDivisionError."""
+    a = float(a)
+    b = float(b)
+    if operation == "Add":
+        return a + b
+    elif operation == "Subtract":
+        return a - b
+    elif operation == "Multiply":
+        return a * b
+    elif operation == "Divide":
+        if b == 0:
+            raise ZeroDivisionError
+        return a / b
+    raise ValueError(f"Unknown operation: {operation}")
+
+# ---------------- Batch Helpers ---------------- #
+def evaluate_batch(a, b, operation):
+    """Apply an operation element-wise; bad cells are masked, not fatal.
+
+    Returns (result, error) where `result` is NaN wherever `error` holds a
+    message ("invalid number" or "division by zero") and "" elsewhere.
+    """
+    a = pd.to_numeric(pd.Series(a), errors="coerce").to_numpy(dtype=float)
+    b = pd.to_numeric(pd.Series(b), errors="coerce").to_numpy(dtype=float)
+    invalid = np.isnan(a) | np.isnan(b)
+    div_zero = ~invalid & (b == 0) if operation == "Divide" else np.zeros_like(invalid)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = OPERATIONS[operation](a, b)
+    result[invalid | div_zero] = np.nan
+
+    error = np.full(len(a), "", dtype=object)
+    error[invalid] = "invalid number"
+    error[div_zero] = "division by zero"
+    return result, error
+
+
+def run_batch(chunks, col_a, col_b, operation):
+    """Evaluate a stream of DataFrame chunks into a temporary CSV file.
+
+    Returns (file, stats) with the file rewound for download. The file is
+    unbuffered because `st.download_button` only accepts raw file objects.
+    """
+    out = tempfile.TemporaryFile(buffering=0)
+    rows = errors = 0
+    start = time.perf_counter()
+    for i, chunk in enumerate(chunks):
+        result, error = evaluate_batch(chunk[col_a], chunk[col_b], operation)
+        frame = pd.DataFrame({"a": chunk[col_a], "b": chunk[col_b], "result": result, "error": error})
+        out.write(frame.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+        rows += len(frame)
+        errors += int((error != "").sum())
+    elapsed = time.perf_counter() - start
+    out.seek(0)
+    return out, {"rows": rows, "errors": errors, "seconds": elapsed,
+                 "rows_per_sec": rows / elapsed if elapsed else 0.0}
+
+
+def batch_mode(operation):
+    source = st.radio("Input", ["Upload CSV", "Paste columns"], horizontal=True)
+    if source == "Upload CSV":
+        upload = st.file_uploader("CSV file", type=["csv"])
+        if not upload:
+            return
+        columns = list(pd.read_csv(upload, nrows=0).columns)
+        upload.seek(0)
+        if len(columns) < 2:
+            st.error("❌ The CSV needs at least two columns.")
+            return
+        col1, col2 = st.columns(2)
+        col_a = col1.selectbox("First number column", columns, index=0)
+        col_b = col2.selectbox("Second number column", columns, index=1)
+        make_chunks = lambda: pd.read_csv(upload, usecols=[col_a, col_b], dtype=str, chunksize=CHUNK_ROWS)
+    else:
+        pasted = st.text_area("Two columns per line (separated by comma, tab or space):", height=200)
+        if not pasted.strip():
+            return
+        col_a, col_b = 0, 1
+        make_chunks = lambda: pd.read_csv(
+            io.StringIO(pasted), sep=r"[,\t ]+", engine="python", header=None,
+            usecols=[0, 1], dtype=str, chunksize=CHUNK_ROWS,
+        )
+
+    if st.button("Calculate batch"):
+        try:
+            out, stats = run_batch(make_chunks(), col_a, col_b, operation)
+        except (ValueError, pd.errors.ParserError) as e:
+            st.error(f"❌ Could not read the input: {e}")
+            return
+        st.success(f"✅ Processed {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+                   f"({stats['rows_per_sec']:,.0f} rows/sec).")
+        if stats["errors"]:
+            st.warning(f"⚠️ {stats['errors']:,} row(s) had invalid numbers or division by zero (left blank).")
+        st.download_button("⬇️ Download results", data=out, file_name="results.csv", mime="text/csv")
+
+# ---------------- Expression Mode ---------------- #
+def parse_variables(text):
+    """Parse 'x=2, y=3.5' into a dict of raw string values."""
+    variables = {}
+    for part in text.replace(";", ",").split(","):
+        if part.strip():
+            name, sep, value = part.partition("=")
+            if not sep or not name.strip().isidentifier():
+                raise ExpressionError(f"Bad variable assignment: {part.strip()!r}")
+            variables[name.strip()] = value.strip()
+    return variables
+
+
+def expression_mode():
+    expr = st.text_input("Expression:", placeholder="e.g. (a + b) * sqrt(x) / 3")
+    names = variable_names(expr)
+    variables_text = st.text_input(
+        "Variables:", placeholder=", ".join(f"{n}=1" for n in names) or "x=2, y=3"
+    )
+    precision = st.radio("Precision", MODES, horizontal=True,
+                         format_func={"float": "Float", "decimal": "Exact decimal", "fraction": "Exact fraction"}.get)
+
+    if st.button("Evaluate"):
+        try:
+            result = evaluate(expr, parse_variables(variables_text), precision)
+            text = str(result)
+        except ValueError as e:  # ExpressionError, or a result too long to print
+            st.error(f"❌ {e}")
+            return
+        st.success(f"✅ Result: {text}")
+        info = compile_expression.cache_info()
+        st.caption(f"Compiled-expression cache: {info.hits} hits, {info.misses} misses, {info.currsize} cached.")
+
+# ---------------- App ---------------- #
 def calculator():
     st.title("🧮 Interactive Calculator")
     st.markdown("Perform basic arithmetic operations with error handling.")
 
+    mode = st.radio("Mode", ["Single", "Batch", "Expression"], horizontal=True)
+    if mode == "Expression":
+        expression_mode()
+        return
+    operation = st.radio("Choose operation", list(OPERATIONS))
+
+    if mode == "Batch":
+        batch_mode(operation)
+        return
+
     # Inputs
     col1, col2 = st.columns(2)
     with col1:
@@ -11,24 +168,12 @@ def calculator():
     with col2:
         b = st.text_input("Enter second number:")
 
-    operation = st.radio("Choose operation", ["Add", "Subtract", "Multiply", "Divide"])
-
     if st.button("Calculate"):
         try:
-            a = float(a)
-            b = float(b)
-            if operation == "Add":
-                result = a + b
-            elif operation == "Subtract":
-                result = a - b
-            elif operation == "Multiply":
-                result = a * b
-            elif operation == "Divide":
-                if b == 0:
-                    st.error("❌ Error: Division by zero is not allowed.")
-                    return
-                result = a / b
+            result = calculate(a, b, operation)
             st.success(f"✅ Result: {result}")
+        except ZeroDivisionError:
+            st.error("❌ Error: Division by zero is not allowed.")
         except ValueError:
             st.error("❌ Please enter valid numeric values.")
 
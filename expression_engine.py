@@ -0,0 +1,207 @@
+"""
+Safe arithmetic expression engine for the calculator.
+
+Expressions are parsed with `ast` and checked against a whitelist of node
+types, operators and functions (nothing is ever passed to `eval`). A valid
+tree is compiled once into nested closures and kept in an LRU cache, so
+evaluating the same or a parameterized expression again skips parsing.
+
+Three number modes are supported: "float", "decimal" (exact decimal
+arithmetic) and "fraction" (exact rationals). Functions without an exact
+implementation are computed in floating point and converted back.
+"""
+
+import ast
+import math
+import operator
+from decimal import Decimal, InvalidOperation, localcontext
+from fractions import Fraction
+from functools import lru_cache
+
+MODES = ["float", "decimal", "fraction"]
+MAX_LENGTH = 1000
+MAX_EXPONENT = 10_000
+MAX_DIGITS = 4_000  # Cap on exact results; Python refuses to print ints over 4300 digits
+DECIMAL_PRECISION = 50
+
+BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+FUNCTIONS = {
+    "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "floor": math.floor, "ceil": math.ceil,
+    "abs": abs, "round": round, "min": min, "max": max,
+}
+# Functions that already work on Decimal/Fraction values without losing exactness
+EXACT_FUNCTIONS = {"abs", "round", "min", "max", "floor", "ceil"}
+# Exact functions that return a Python int, whose size must be checked first
+INTEGER_FUNCTIONS = {"round", "floor", "ceil"}
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+CONVERT = {
+    "float": float,
+    "decimal": lambda v: Decimal(repr(v)) if isinstance(v, float) else Decimal(v),
+    "fraction": lambda v: Fraction(repr(v)) if isinstance(v, float) else Fraction(v),
+}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are invalid, unsafe or fail to evaluate."""
+
+
+# ---------------- Compilation ---------------- #
+def _magnitude(value):
+    """Approximate number of decimal digits in a value's integer part."""
+    if isinstance(value, Fraction):
+        return max(0.0, math.log10(abs(value.numerator) or 1) - math.log10(value.denominator))
+    if isinstance(value, Decimal):
+        return max(0, value.adjusted()) if value.is_finite() else 0
+    if isinstance(value, int):
+        return math.log10(abs(value) or 1)
+    return math.log10(abs(value)) if math.isfinite(value) and abs(value) > 1 else 0.0
+
+
+def _digits(value):
+    """Decimal digits needed to write an exact value (numerator or denominator)."""
+    if isinstance(value, Fraction):
+        return max(_digits(value.numerator), _digits(value.denominator))
+    if isinstance(value, int):
+        return value.bit_length() * 0.30103  # log10(2)
+    return 0
+
+
+def _bounded(value):
+    if _digits(value) > MAX_DIGITS:
+        raise ExpressionError("Result too large")
+    return value
+
+
+def _compile_node(node, mode):
+    convert = CONVERT[mode]
+
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported literal: {node.value!r}")
+        value = convert(node.value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = convert(CONSTANTS[name])
+            return lambda env: value
+
+        def lookup(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise ExpressionError(f"Unknown variable: {name}") from None
+        return lookup
+
+    if isinstance(node, ast.BinOp):
+        op = BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Operator not allowed: {type(node.op).__name__}")
+        left, right = _compile_node(node.left, mode), _compile_node(node.right, mode)
+        if op is operator.pow:
+            def power(env):
+                base, exp = left(env), right(env)
+                if abs(exp) > MAX_EXPONENT or abs(float(exp)) * _magnitude(base) > MAX_DIGITS:
+                    raise ExpressionError("Exponent too large")
+                return _bounded(base ** exp) if mode == "fraction" else base ** exp
+            return power
+        if mode == "fraction":
+            # Exact rationals grow without limit; keep every intermediate printable.
+            return lambda env: _bounded(op(left(env), right(env)))
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Operator not allowed: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, mode)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise ExpressionError("Only whitelisted functions may be called")
+        name = node.func.id
+        func = FUNCTIONS[name]
+        args = [_compile_node(a, mode) for a in node.args]
+        if mode != "float" and name in INTEGER_FUNCTIONS:
+            def to_integer(env):
+                values = [a(env) for a in args]
+                if values and _magnitude(values[0]) > MAX_DIGITS:
+                    raise ExpressionError("Result too large")
+                return func(*values)
+            return to_integer
+        if mode == "float" or name in EXACT_FUNCTIONS:
+            return lambda env: func(*(a(env) for a in args))
+        if mode == "decimal" and name == "sqrt":
+            return lambda env: args[0](env).sqrt()
+        # No exact version: compute in float and convert back to the mode's type.
+        return lambda env: convert(func(*(float(a(env)) for a in args)))
+
+    raise ExpressionError(f"Syntax not allowed: {type(node).__name__}")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expr, mode="float"):
+    """Parse, validate and compile an expression (results are LRU-cached)."""
+    if mode not in MODES:
+        raise ExpressionError(f"Unknown mode: {mode}")
+    if len(expr) > MAX_LENGTH:
+        raise ExpressionError("Expression is too long")
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid syntax: {e.msg}") from None
+    return _compile_node(tree.body, mode)
+
+
+def variable_names(expr):
+    """Free variable names used by an expression."""
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError:
+        return []
+    names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+    return sorted(names - set(FUNCTIONS) - set(CONSTANTS))
+
+
+def evaluate(expr, variables=None, mode="float"):
+    """Evaluate an expression with optional variables in the given number mode."""
+    fn = compile_expression(expr, mode)
+    convert = CONVERT[mode]
+    try:
+        env = {k: convert(v) for k, v in (variables or {}).items()}
+        if mode == "fraction":
+            for v in env.values():
+                _bounded(v)
+        if mode == "decimal":
+            with localcontext() as ctx:
+                ctx.prec = DECIMAL_PRECISION
+                result = fn(env)
+        else:
+            result = fn(env)
+    except ExpressionError:
+        raise
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero") from None
+    except InvalidOperation:
+        raise ExpressionError("Invalid operation") from None
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise ExpressionError(str(e) or type(e).__name__) from None
+    if isinstance(result, complex):
+        raise ExpressionError("Result is not a real number")
+    return result
@@ -0,0 +1,394 @@
+"""
+Shared core for NovaLearn AI+ (used by NovaLearnAI.py and focusflow.py).
+
+Holds the question-generation model loader, the text helpers and the CSV
+storage layer so every entry point in a process shares one cached model
+and writes through the same locked, append-only storage functions.
+"""
+
+import os
+import random
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+
+import pandas as pd
+import streamlit as st
+
+# ---------------------------- CONFIG ---------------------------- #
+DATA_DIR = "novalearn_data"
+SYLLABUS_TXT = os.path.join(DATA_DIR, "syllabus_text.txt")
+QUESTIONS_CSV = os.path.join(DATA_DIR, "generated_questions.csv")
+QUIZ_RESULTS_CSV = os.path.join(DATA_DIR, "quiz_results.csv")
+SYLLABUS_INDEX_CSV = os.path.join(DATA_DIR, "syllabus_index.csv")
+
+QUESTION_COLS = ["id", "timestamp", "topic", "qtype", "question", "options", "answer"]
+RESULT_COLS = ["timestamp", "topic", "qtype", "question", "correct", "user_answer", "correct_answer"]
+
+MODEL_NAME = "valhalla/t5-base-qg-hl"
+LOCK_TIMEOUT = 10  # seconds
+STALE_LOCK = 60  # seconds before an abandoned lock file is broken
+
+STOPWORDS = set("""
+the a an and or but for nor so yet to of in on at by with from into during including until against
+among throughout despite towards upon about above below over under again further then once here there
+all any both each few more most other some such no not only own same than too very can will just is
+are was were be been being as it its that this these those who whom whose which what when where why how
+""".split())
+
+
+# ------------------------ STORAGE LAYER ------------------------- #
+def _lock_owner(lock_path):
+    try:
+        with open(lock_path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _break_stale_lock(lock_path):
+    """Remove a lock file older than STALE_LOCK, unless it was retaken meanwhile."""
+    owner = _lock_owner(lock_path)
+    try:
+        if owner is None or time.time() - os.path.getmtime(lock_path) <= STALE_LOCK:
+            return
+        # Rename is atomic, so only one waiter can claim this lock file.
+        claimed = f"{lock_path}.{uuid.uuid4().hex}.stale"
+        os.rename(lock_path, claimed)
+    except OSError:
+        return
+    if _lock_owner(claimed) != owner:
+        # Another waiter broke the stale lock first and we took its fresh one: put it back.
+        try:
+            os.link(claimed, lock_path)
+        except OSError:
+            pass
+    os.remove(claimed)
+
+
+@contextmanager
+def file_lock(path):
+    """Cross-process lock using an exclusive lock file next to `path`.
+
+    Every writer of the novalearn CSVs goes through this, so two apps (or
+    two sessions) can no longer interleave read-modify-write cycles. The
+    lock file holds its owner's token, so a lock is only ever removed by
+    its owner or, once stale, by the single waiter that claims it.
+    """
+    lock_path = path + ".lock"
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, token.encode())
+            break
+        except FileExistsError:
+            _break_stale_lock(lock_path)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        if _lock_owner(lock_path) == token:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:  # Broken as stale while we held it
+                pass
+
+
+def safe_read_csv(path, cols):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=cols)
+    try:
+        df = pd.read_csv(path)
+        for c in cols:
+            if c not in df.columns:
+                df[c] = ""
+        return df
+    except Exception:
+        return pd.DataFrame(columns=cols)
+
+
+def safe_write_csv(path, df):
+    """Replace a CSV atomically (write a temp file, then rename over it)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def append_csv_rows(path, cols, rows):
+    """Append rows without rewriting the file; the caller must hold the lock."""
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    pd.DataFrame(rows, columns=cols).to_csv(path, mode="a", header=new_file, index=False)
+
+
+def save_questions(qs):
+    """Append generated questions to the question bank with fresh ids."""
+    if not qs:
+        return []
+    os.makedirs(DATA_DIR, exist_ok=True)
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M")
+    with file_lock(QUESTIONS_CSV):
+        ids = safe_read_csv(QUESTIONS_CSV, ["id"])["id"]
+        start_id = 1 if ids.empty else int(pd.to_numeric(ids, errors="coerce").max()) + 1
+        rows = [{
+            "id": start_id + i,
+            "timestamp": ts,
+            "topic": q["topic"],
+            "qtype": q["qtype"],
+            "question": q["question"],
+            "options": "|".join(q["options"]),
+            "answer": q["answer"]
+        } for i, q in enumerate(qs)]
+        append_csv_rows(QUESTIONS_CSV, QUESTION_COLS, rows)
+    return rows
+
+
+def record_result(topic, qtype, question, correct, user_ans, correct_ans):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    row = [datetime.now().strftime("%Y-%m-%d %H:%M"), topic, qtype, question, int(correct), user_ans, correct_ans]
+    with file_lock(QUIZ_RESULTS_CSV):
+        append_csv_rows(QUIZ_RESULTS_CSV, RESULT_COLS, [row])
+
+
+def save_syllabus(text):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with file_lock(SYLLABUS_TXT):
+        tmp = f"{SYLLABUS_TXT}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, SYLLABUS_TXT)
+
+
+def save_syllabus_index(df):
+    """Replace the per-sentence topic index built by syllabus_segmenter."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with file_lock(SYLLABUS_INDEX_CSV):
+        safe_write_csv(SYLLABUS_INDEX_CSV, df)
+
+
+def load_syllabus():
+    if not os.path.exists(SYLLABUS_TXT):
+        return ""
+    with open(SYLLABUS_TXT, encoding="utf-8") as f:
+        return f.read()
+
+
+# ------------------------- TEXT HELPERS ------------------------- #
+def clean_text_for_sentences(text):
+    """Split text into clean, meaningful sentences."""
+    text = re.sub(r"\s+", " ", text)
+    sents = re.split(r"(?<=[.!?])\s", text)
+    return [s.strip() for s in sents if len(s.split()) >= 6]
+
+
+def pick_answer_candidates(sent, max_k=2):
+    """Extract good potential answers (nouns / entities) from a sentence."""
+    s = re.sub(r"\s+", " ", sent).strip()
+    phrases = re.findall(r"(?:[A-Z][a-z]+(?:\s+(?:of|the|and|[A-Z][a-z]+))+)", s)
+    singles = re.findall(r"\b[A-Z][a-z]{2,}\b", s)
+    content = [w for w in re.findall(r"[A-Za-z\-]{4,}", s) if w.lower() not in STOPWORDS]
+    seen, cands = set(), []
+    for x in phrases + singles + content:
+        if x not in seen:
+            seen.add(x)
+            cands.append(x)
+    return cands[:max_k] if cands else ["concept"]
+
+
+# One tokenizer for the whole syllabus: each match is a sentence end or an
+# answer candidate, with the candidate kinds in pick_answer_candidates'
+# priority order (multi-word phrase > capitalized word > content word).
+# A content word is captured whole by the lookahead but only consumed up to
+# its next capital, so a phrase or capitalized word starting inside it
+# ("well-Known Facts") is still found.
+TOKEN_RE = re.compile(
+    r"(?P<end>[.!?] )"
+    r"|(?P<phrase>[A-Z][a-z]+(?:\s+(?:of|the|and|[A-Z][a-z]+))+)"
+    r"|(?P<single>\b[A-Z][a-z]{2,}\b)"
+    r"|(?=(?P<content>[A-Za-z\-]{4,}))[A-Za-z\-][a-z\-]*"
+)
+CANDIDATE_RANK = {"phrase": 0, "single": 1, "content": 2}
+WHITESPACE_RE = re.compile(r"\s+")
+REPEATED_Q_RE = re.compile(r"(\?\s*){2,}")
+NON_WORD_RE = re.compile(r"\W+")
+
+
+def scan_sentences(text, max_k=2):
+    """Yield (sentence_id, sentence_span, [(candidate, span), ...]) in one pass.
+
+    `text` must be whitespace-normalized (as returned by prepare_text).
+    Sentences match clean_text_for_sentences and the first candidate matches
+    pick_answer_candidates(sent, max_k=1). Later candidates differ only in
+    that words inside a phrase are not offered again on their own, and a
+    sentence without candidates gets an empty list instead of "concept".
+    Spans index into `text`; sentence ids count meaningful (6+ word)
+    sentences only.
+    """
+    sid, start, content_end = 0, 0, 0
+    buckets, best = ([], [], []), len(CANDIDATE_RANK)
+    for m in chain(TOKEN_RE.finditer(text), [None]):
+        if m is None or m.lastgroup == "end":
+            end = len(text) if m is None else m.start() + 1
+            if text.count(" ", start, end) >= 5:  # 6+ words
+                yield sid, (start, end), _ranked(buckets, max_k)
+                sid += 1
+            if m is not None:
+                start, best = m.end(), len(CANDIDATE_RANK)
+                for bucket in buckets:
+                    bucket.clear()
+            continue
+        kind = m.lastgroup
+        if kind == "content":
+            if m.start() < content_end:  # Tail of a content word already seen
+                continue
+            content_end = m.end(kind)
+            if m.group(kind).lower() in STOPWORDS:
+                continue
+        rank = CANDIDATE_RANK[kind]
+        # With one answer wanted, only the first match of the best kind matters.
+        if max_k == 1:
+            if rank >= best:
+                continue
+            best = rank
+        buckets[rank].append(m)
+
+
+def _ranked(buckets, max_k):
+    seen, cands = set(), []
+    for bucket in buckets:
+        for m in bucket:
+            c = m.group(m.lastgroup)
+            if c not in seen:
+                seen.add(c)
+                cands.append((c, m.span(m.lastgroup)))
+                if len(cands) == max_k:
+                    return cands
+    return cands
+
+
+def iter_candidates(text, max_k=2):
+    """Yield (sentence_id, candidate, span) for the whole text, best first per sentence."""
+    for sid, _, cands in scan_sentences(text, max_k):
+        for cand, span in cands:
+            yield sid, cand, span
+
+
+def clean_question(q):
+    """Tidy up generated question text."""
+    q = WHITESPACE_RE.sub(" ", q).strip()
+    q = REPEATED_Q_RE.sub("?", q)
+    if not q.endswith("?"):
+        q += "?"
+    return q[0].upper() + q[1:]
+
+
+# ---------------------- MODEL INITIALIZATION -------------------- #
+def build_qg_pipeline(model_name=MODEL_NAME):
+    """Create the question-generation pipeline; returns (pipeline, device).
+
+    Raises if the model cannot be loaded.
+    """
+    # Imported here so the storage/text helpers stay usable without torch installed.
+    import torch
+    from transformers import pipeline
+
+    device = 0 if torch.cuda.is_available() else -1
+    return pipeline("text2text-generation", model=model_name, device=device), device
+
+
+@st.cache_resource(show_spinner=False)
+def load_qg_model():
+    """One model instance per server process, shared by every entry point."""
+    try:
+        qg, device = build_qg_pipeline()
+        st.sidebar.success(f"✅ Model loaded ({'GPU' if device == 0 else 'CPU'})")
+        return qg
+    except Exception as e:
+        st.sidebar.error(f"❌ Model load failed: {e}")
+        return None
+
+
+# ---------------------- QUESTION GENERATION --------------------- #
+def prepare_text(text):
+    text = re.sub(r"(Table|Figure|Index|Appendix|Page\s+\d+|\.{5,})", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def build_prompts(text, num_q):
+    """Return (answer, prompt) pairs, one highlighted context per sentence.
+
+    Scans only as far as the first `num_q` sentences of the prepared text.
+    """
+    num_q = min(int(num_q), 25)
+    prompts, found = [], False
+    for sid, (start, end), cands in scan_sentences(text, max_k=1):
+        found = True
+        if sid >= num_q:
+            break
+        if cands:
+            # Highlight the answer where it was found in the sentence
+            ans, (a, b) = cands[0]
+            prompts.append((ans, f"generate question: context: {text[start:a]}<hl> {ans} <hl>{text[b:end]}"))
+    if not found:
+        raise ValueError("No meaningful sentences found.")
+    return prompts
+
+
+def distractor_pool(text):
+    return [w for w in re.findall(r"[A-Za-z][A-Za-z\-]{4,}", text) if w.lower() not in STOPWORDS]
+
+
+def make_questions(outputs, answers, qtype, topic, words):
+    """Turn raw model outputs into de-duplicated question entries."""
+    qs, seen = [], set()
+    for out, ans in zip(outputs, answers):
+        if out is None:
+            continue
+        qtext = clean_question(out)
+        norm_key = NON_WORD_RE.sub("", qtext.lower())
+        if norm_key in seen:
+            continue
+        seen.add(norm_key)
+
+        entry = {
+            "topic": topic,
+            "qtype": qtype,
+            "question": qtext,
+            "answer": ans,
+            "options": []
+        }
+
+        # MCQ distractors
+        if qtype == "MCQ":
+            distractors = random.sample(words, min(3, len(words))) if len(words) >= 3 else ["Model", "System", "Theory"]
+            distractors = [d for d in distractors if d.lower() != ans.lower()]
+            options = [ans] + distractors
+            random.shuffle(options)
+            entry["options"] = options
+
+        qs.append(entry)
+    return qs
+
+
+def generate_questions(qg, text, num_q, qtype, topic):
+    """Highlight-based question generation, saved to the question bank."""
+    text = prepare_text(text)
+    prompts = build_prompts(text, num_q)
+
+    outputs = []
+    for _, prompt in prompts:
+        try:
+            outputs.append(qg(prompt, max_new_tokens=48, num_beams=4, do_sample=False)[0]["generated_text"])
+        except Exception:
+            outputs.append(None)
+
+    qs = make_questions(outputs, [a for a, _ in prompts], qtype, topic, distractor_pool(text))
+    save_questions(qs)
+    return qs
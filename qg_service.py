@@ -0,0 +1,270 @@
+"""
+Headless question-generation service for NovaLearn AI+.
+
+Generates question banks for many syllabi without the Streamlit UI, either
+from the command line or as a small local HTTP service. Prompts from all
+concurrent requests are coalesced into shared model batches (dynamic
+batching with a max-wait window), identical in-flight prompts share a single
+model call, text extraction (PDF, DOCX, TXT, Markdown, HTML) fans out to a
+process pool, and the resulting questions are appended to the question bank
+in one bulk write.
+
+The model is loaded with Hugging Face offline mode forced on, so it must
+already be in the local cache (or be given as a local directory).
+
+Usage:
+    python qg_service.py generate syllabus.pdf notes.txt --qtype MCQ --num-q 10
+    python qg_service.py serve --port 8765
+    curl -X POST localhost:8765/generate -d '{"syllabi": [{"text": "...", "topic": "Biology"}]}'
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from novalearn_core import (
+    MODEL_NAME, build_qg_pipeline, build_prompts, distractor_pool,
+    make_questions, prepare_text, save_questions,
+)
+from syllabus_ingest import extract_text, supported_extensions
+
+GEN_KWARGS = {"max_new_tokens": 48, "num_beams": 4, "do_sample": False}
+QTYPES = ("MCQ", "Short Answer")
+
+
+# ---------------------- DYNAMIC BATCHING ------------------------ #
+class DynamicBatcher:
+    """Collects prompts from many threads and runs them through the model in batches.
+
+    A batch is dispatched when `max_batch` prompts are waiting or `max_wait`
+    seconds after its first prompt arrived, whichever comes first.
+    """
+
+    def __init__(self, qg, max_batch=16, max_wait=0.05):
+        self.qg = qg
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = {"prompts": 0, "coalesced": 0, "batches": 0}
+        self._queue = queue.Queue()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt):
+        """Future for one prompt's generated text (None if generation failed)."""
+        with self._lock:
+            self.stats["prompts"] += 1
+            fut = self._inflight.get(prompt)
+            if fut is not None:  # Same prompt already queued: share its result
+                self.stats["coalesced"] += 1
+                return fut
+            fut = self._inflight[prompt] = Future()
+        self._queue.put(prompt)
+        return fut
+
+    def generate(self, prompts):
+        futures = [self.submit(p) for p in prompts]
+        return [f.result() for f in futures]
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            outputs = self._generate_batch(batch)
+            with self._lock:
+                self.stats["batches"] += 1
+                futures = [self._inflight.pop(p) for p in batch]
+            for fut, out in zip(futures, outputs):
+                fut.set_result(out)
+
+    def _generate_batch(self, prompts):
+        try:
+            results = self.qg(prompts, batch_size=len(prompts), **GEN_KWARGS)
+            return [(r[0] if isinstance(r, list) else r)["generated_text"] for r in results]
+        except Exception:
+            # Retry one by one so a single bad prompt does not sink the batch.
+            outputs = []
+            for p in prompts:
+                try:
+                    outputs.append(self.qg(p, **GEN_KWARGS)[0]["generated_text"])
+                except Exception:
+                    outputs.append(None)
+            return outputs
+
+
+# ------------------------ SERVICE LAYER ------------------------- #
+class QuestionService:
+    def __init__(self, qg, max_batch=16, max_wait=0.05, workers=8):
+        self.batcher = DynamicBatcher(qg, max_batch, max_wait)
+        self.workers = workers
+
+    def generate_for_text(self, text, num_q=10, qtype="Short Answer", topic="General"):
+        num_q, qtype, topic = check_params(num_q, qtype, topic)
+        text = prepare_text(text)
+        try:
+            prompts = build_prompts(text, num_q)
+        except ValueError:  # No meaningful sentences in this syllabus
+            return []
+        outputs = self.batcher.generate([p for _, p in prompts])
+        return make_questions(outputs, [a for a, _ in prompts], qtype, topic, distractor_pool(text))
+
+    def generate_bulk(self, jobs, save=True):
+        """Generate for many syllabi concurrently and save them in one write.
+
+        `jobs` are dicts with "text" and optional "num_q", "qtype", "topic".
+        Returns one question list per job.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(
+                lambda job: self.generate_for_text(
+                    job["text"], job.get("num_q", 10), job.get("qtype", "Short Answer"), job.get("topic", "General")
+                ),
+                jobs,
+            ))
+        if save:
+            save_questions([q for qs in results for q in qs])
+        return results
+
+
+def check_params(num_q, qtype, topic):
+    """Validate one job's generation parameters; raises ValueError if they are bad."""
+    if isinstance(num_q, bool) or not isinstance(num_q, int) or num_q < 1:
+        raise ValueError(f"'num_q' must be a positive integer, got {num_q!r}")
+    if qtype not in QTYPES:
+        raise ValueError(f"'qtype' must be one of {', '.join(QTYPES)}, got {qtype!r}")
+    if not isinstance(topic, str):
+        raise ValueError(f"'topic' must be a string, got {topic!r}")
+    return num_q, qtype, topic
+
+
+def read_syllabi(paths, processes=None):
+    """Extract text from many files, fanning extraction out to a process pool."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(extract_text, paths))
+
+
+def load_offline_model(model=MODEL_NAME):
+    """Load the QG pipeline from the local cache only (never touches the network)."""
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    qg, _ = build_qg_pipeline(model)
+    return qg
+
+
+# -------------------------- HTTP SERVER ------------------------- #
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", **service.batcher.stats})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                jobs = request.get("syllabi") or [request]
+                for job in jobs:
+                    if not isinstance(job, dict) or not isinstance(job.get("text"), str) or not job["text"]:
+                        raise ValueError("each syllabus needs a non-empty 'text'")
+                    check_params(job.get("num_q", 10), job.get("qtype", "Short Answer"), job.get("topic", "General"))
+            except (ValueError, AttributeError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            try:
+                results = service.generate_bulk(jobs, save=request.get("save", True))
+            except Exception as e:
+                self.log_error("generation failed: %r", e)
+                self._send(500, {"error": "question generation failed"})
+                return
+            self._send(200, {"results": results})
+
+    return Handler
+
+
+def serve(service, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving question generation on http://{host}:{port} (POST /generate, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ------------------------------ CLI ----------------------------- #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless NovaLearn question generation")
+    parser.add_argument("--model", default=MODEL_NAME, help="model id in the local HF cache, or a local directory")
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait", type=float, default=0.05, help="seconds to wait while filling a batch")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help=f"generate questions for syllabus files ({', '.join(supported_extensions())})")
+    gen.add_argument("files", nargs="+")
+    gen.add_argument("--num-q", type=int, default=10)
+    gen.add_argument("--qtype", choices=QTYPES, default="Short Answer")
+    gen.add_argument("--topic", help="topic for every file (default: the file name)")
+    gen.add_argument("--processes", type=int, default=None, help="PDF extraction processes")
+    gen.add_argument("--no-save", action="store_true", help="print questions instead of saving them")
+
+    srv = sub.add_parser("serve", help="run the local HTTP service")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args(argv)
+    service = QuestionService(load_offline_model(args.model), args.max_batch, args.max_wait)
+
+    if args.command == "serve":
+        serve(service, args.host, args.port)
+        return 0
+
+    start = time.perf_counter()
+    texts = read_syllabi(args.files, args.processes)
+    jobs = [{
+        "text": text,
+        "num_q": args.num_q,
+        "qtype": args.qtype,
+        "topic": args.topic or os.path.splitext(os.path.basename(path))[0],
+    } for path, text in zip(args.files, texts)]
+    results = service.generate_bulk(jobs, save=not args.no_save)
+    if args.no_save:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    total = sum(len(qs) for qs in results)
+    stats = service.batcher.stats
+    print(f"{total} questions from {len(jobs)} syllabi in {time.perf_counter() - start:.1f}s "
+          f"({stats['batches']} model batches, {stats['coalesced']} coalesced prompts)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
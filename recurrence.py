@@ -0,0 +1,134 @@
+"""
+Recurrence rules for repeating tasks.
+
+A rule is "daily", "weekly" or a five-field cron expression
+("minute hour day-of-month month day-of-week", e.g. "0 9 * * 1-5").
+Only the next due date of a series is stored; later instances are
+generated on demand by `occurrences`.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+
+PRESETS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+
+# (low, high) bounds of each cron field
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+MAX_SEARCH_DAYS = 366 * 5
+
+
+def _parse_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron field: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range ({low}-{high}): {field}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+@lru_cache(maxsize=256)
+def parse_rule(rule):
+    """Validate a rule and return its parsed form (cached per rule string)."""
+    rule = rule.strip().lower()
+    if rule in PRESETS:
+        return PRESETS[rule]
+    fields = rule.split()
+    if len(fields) != 5:
+        raise ValueError(f"Unknown recurrence rule: {rule!r}")
+    minutes, hours, doms, months, dows = (
+        _parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, CRON_FIELDS)
+    )
+    return {
+        "minutes": minutes,
+        "hours": hours,
+        "doms": set(doms),
+        "months": set(months),
+        "dows": {d % 7 for d in dows},  # 0 and 7 both mean Sunday
+        # Standard cron: if both day fields are restricted, either may match.
+        "dom_any": fields[2] == "*",
+        "dow_any": fields[4] == "*",
+    }
+
+
+def _day_matches(spec, day):
+    if day.month not in spec["months"]:
+        return False
+    dom_ok = day.day in spec["doms"]
+    dow_ok = (day.isoweekday() % 7) in spec["dows"]
+    if spec["dom_any"] or spec["dow_any"]:
+        return dom_ok and dow_ok
+    return dom_ok or dow_ok
+
+
+def next_occurrence(rule, after):
+    """First occurrence strictly after `after` (a datetime)."""
+    spec = parse_rule(rule)
+    if isinstance(spec, timedelta):
+        return after + spec
+
+    after = after.replace(second=0, microsecond=0)
+    day = after.replace(hour=0, minute=0)
+    for _ in range(MAX_SEARCH_DAYS):
+        if _day_matches(spec, day):
+            for h in spec["hours"]:
+                for m in spec["minutes"]:
+                    candidate = day.replace(hour=h, minute=m)
+                    if candidate > after:
+                        return candidate
+        day += timedelta(days=1)
+    raise ValueError(f"Rule never fires: {rule!r}")
+
+
+@lru_cache(maxsize=256)
+def check_rule(rule):
+    """Validate a rule for storing: it must parse and fire at least once.
+
+    Rules such as "0 9 30 2 *" parse but never fire; accepting them would
+    leave a series that can never be advanced or listed.
+    """
+    next_occurrence(rule, datetime.now())
+    return parse_rule(rule)
+
+
+def occurrences(rule, start, until=None):
+    """Lazily yield occurrences after `start`, stopping before `until` if given."""
+    current = start
+    while True:
+        current = next_occurrence(rule, current)
+        if until is not None and current >= until:
+            return
+        yield current
+
+
+def advance(rule, due, now=None):
+    """Next due date for a series after completing the instance due at `due`.
+
+    Occurrences that already lie in the past are skipped so completing a
+    long-overdue daily task does not leave a backlog of overdue instances;
+    "daily" and "weekly" series stay on their original time of day.
+    """
+    now = now or datetime.now()
+    spec = parse_rule(rule)
+    if isinstance(spec, timedelta):
+        # Step by whole periods so the series keeps its time of day.
+        periods = max(1, (now - due) // spec + 1)
+        return due + periods * spec
+    return next_occurrence(rule, max(due, now))
+
+
+def preview(rule, start, count=5):
+    return list(islice(occurrences(rule, start), count))
@@ -0,0 +1,160 @@
+"""
+Background reminders for the To-Do List app.
+
+A single daemon thread keeps pending deadlines in a min-heap keyed on due
+time and sleeps on a condition variable until the earliest one, so it does
+no work between deadlines however many tasks are pending. When a deadline
+passes, a reminder event is kept in memory for the app to toast and is
+appended to a JSON Lines outbox file for anything else that wants to
+notify.
+
+The scheduler follows the task store through its change listener: edits,
+snoozes and completions re-key just the affected tasks with an O(log n)
+push, and the superseded heap entries are skipped when they surface (lazy
+deletion). Tasks that are already overdue when the scheduler starts are
+not reminded again.
+"""
+
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from task_store import format_due
+
+REMINDER_OUTBOX = "reminders.jsonl"
+MAX_EVENTS = 1000  # recent reminders kept in memory for toasts
+
+
+class ReminderScheduler:
+    """Fires one reminder per pending task when its due time passes."""
+
+    def __init__(self, store=None, outbox=REMINDER_OUTBOX):
+        self.store = store
+        self.outbox = outbox
+        self.last_event_id = 0
+        self._cond = threading.Condition()
+        self._heap = []  # (due_ts, seq, task_id); stale entries are dropped when they surface
+        self._entries = {}  # task_id -> (due_ts, seq, task) of its live heap entry
+        self._seq = itertools.count()
+        self._events = deque(maxlen=MAX_EVENTS)
+        self._stopped = False
+        if store is not None:
+            self.reload()
+            store.on_change(self.refresh)
+        self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+        self._thread.start()
+
+    # ---------------- Scheduling ---------------- #
+    def reload(self):
+        """Rebuild the heap from the store's pending tasks with future deadlines."""
+        rows = self.store.due_after(int(time.time()))
+        with self._cond:
+            # Rows come back in due order, which is already a valid heap.
+            self._heap = [(due_ts, next(self._seq), i) for i, _, due_ts in rows]
+            self._entries = {i: (due_ts, seq, task) for (due_ts, seq, i), (_, task, _) in zip(self._heap, rows)}
+            self._cond.notify()
+
+    def refresh(self, ids):
+        """Store change listener: re-key the changed tasks (or everything, for None).
+
+        Imports report just the rows each batch inserted, so a large import
+        costs one O(log n) push per new task rather than a reload per batch.
+        """
+        if ids is None:
+            self.reload()
+            return
+        tasks = {t["id"]: t for t in self.store.get_many(ids)}
+        now = time.time()
+        with self._cond:
+            for i in ids:
+                t = tasks.get(i)
+                if t and t["status"] == "pending" and t["due_ts"] is not None and t["due_ts"] > now:
+                    self._push(i, t["task"], t["due_ts"])
+                else:
+                    self._entries.pop(i, None)
+            self._compact()
+            self._cond.notify()
+
+    def _push(self, task_id, task, due_ts):
+        current = self._entries.get(task_id)
+        if current and current[0] == due_ts:
+            self._entries[task_id] = (due_ts, current[1], task)
+            return
+        seq = next(self._seq)
+        self._entries[task_id] = (due_ts, seq, task)
+        heapq.heappush(self._heap, (due_ts, seq, task_id))
+
+    def _live(self, entry):
+        due_ts, seq, task_id = entry
+        current = self._entries.get(task_id)
+        return current is not None and current[1] == seq
+
+    def _compact(self):
+        # Rebuild once stale entries outnumber live ones, bounding the heap at 2x.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(due_ts, seq, i) for i, (due_ts, seq, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._entries)
+
+    # ---------------- Worker ---------------- #
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._wait_for_due()
+            if due is None:
+                return
+            self._publish(due)
+
+    def _wait_for_due(self):
+        """Sleep until the earliest live deadline passes; pop every due entry."""
+        while not self._stopped:
+            while self._heap and not self._live(self._heap[0]):
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._cond.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                self._cond.wait(delay)
+                continue
+            now, due = time.time(), []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if self._live(entry):
+                    due_ts, _, task = self._entries.pop(entry[2])
+                    due.append((entry[2], task, due_ts))
+            return due
+        return None
+
+    def _publish(self, due):
+        fired_at = datetime.now().isoformat(timespec="seconds")
+        with self._cond:
+            events = []
+            for task_id, task, due_ts in due:
+                self.last_event_id += 1
+                events.append({
+                    "event": self.last_event_id, "id": task_id, "task": task,
+                    "due": format_due(due_ts), "fired_at": fired_at,
+                })
+            self._events.extend(events)
+        if self.outbox:
+            with open(self.outbox, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(e) + "\n" for e in events)
+
+    def events_since(self, cursor):
+        """Reminders fired after event number `cursor`, and the new cursor."""
+        with self._cond:
+            return [e for e in self._events if e["event"] > cursor], self.last_event_id
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
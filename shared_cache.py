@@ -0,0 +1,58 @@
+"""
+File-backed state caching shared by the Streamlit apps.
+
+State files are read through `st.cache_data`, keyed on the file's
+modification time and size, so a rerun only re-parses a file after it has
+actually changed on disk (by this process or any other).
+"""
+
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+
+def file_version(path):
+    """Cache key that changes whenever the file is rewritten or appended to."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_json(path, version):
+    if version is None:
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return None
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_csv(path, cols, version):
+    if version is None:
+        return pd.DataFrame(columns=list(cols))
+    try:
+        df = pd.read_csv(path)
+    except Exception:
+        return pd.DataFrame(columns=list(cols))
+    for c in cols:
+        if c not in df.columns:
+            df[c] = ""
+    return df
+
+
+def cached_json(path, default):
+    """Parsed JSON file contents, or `default` if missing or invalid."""
+    data = _read_json(path, file_version(path))
+    return default if data is None else data
+
+
+def cached_csv(path, cols):
+    """DataFrame for a CSV file, with any missing columns added."""
+    return _read_csv(path, tuple(cols), file_version(path))
@@ -0,0 +1,284 @@
+"""
+Streaming syllabus ingestion for NovaLearn AI+.
+
+Extractors are registered per MIME type and yield a document's text one
+block (paragraph, page or HTML block element) at a time, with headings
+marked as Markdown `# ` lines. The blocks stream straight into the
+syllabus segmenter, so the extractors only ever hold one chunk or block of
+the source in memory. Repeated blocks are skipped by content hash, and the
+whole upload is hashed so an unchanged file is not re-indexed on rerun.
+
+Supported: PDF, DOCX, plain text, Markdown and HTML. New formats plug in
+with `@register(mime, ".ext")`.
+"""
+
+import hashlib
+import io
+import os
+import re
+import zipfile
+from html.parser import HTMLParser
+from xml.etree import ElementTree as ET
+
+from syllabus_segmenter import index_sections, iter_pdf_pages, iter_sections, looks_like_heading
+
+CHUNK_SIZE = 64 * 1024  # characters read per step from text sources
+MAX_BLOCK = 256 * 1024  # longest block emitted before a forced split
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TEXT = "text/plain"
+MARKDOWN = "text/markdown"
+HTML = "text/html"
+MIME_ALIASES = {"text/x-markdown": MARKDOWN, "application/xhtml+xml": HTML}
+
+EXTRACTORS = {}  # MIME type -> function(binary file) yielding text blocks
+EXTENSIONS = {}  # ".ext" -> MIME type
+
+
+def register(mime, *extensions):
+    """Register a block extractor for a MIME type and its file extensions."""
+    def decorator(fn):
+        EXTRACTORS[mime] = fn
+        for ext in extensions:
+            EXTENSIONS[ext] = mime
+        return fn
+    return decorator
+
+
+def supported_extensions():
+    return sorted(ext.lstrip(".") for ext in EXTENSIONS)
+
+
+def resolve_mime(name=None, mime=None):
+    """MIME type to extract with, from the file extension or the reported type.
+
+    The extension wins because browsers often report Markdown and other
+    text formats as application/octet-stream.
+    """
+    ext = os.path.splitext(name or "")[1].lower()
+    if ext in EXTENSIONS:
+        return EXTENSIONS[ext]
+    mime = MIME_ALIASES.get(mime, mime)
+    if mime in EXTRACTORS:
+        return mime
+    raise ValueError(f"Unsupported file type: {name or mime}")
+
+
+# ------------------------- TEXT SOURCES ------------------------- #
+def _iter_chunks(upload):
+    """Decoded text from a binary file, CHUNK_SIZE characters at a time."""
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="replace")
+    try:
+        while chunk := text.read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        text.detach()  # Leave the caller's file open
+
+
+PARAGRAPH_RE = re.compile(r"\n[ \t]*\n")
+
+
+@register(TEXT, ".txt")
+def iter_text(upload):
+    """Blank-line separated paragraphs; overlong ones are split at a line end."""
+    buf = ""
+    for chunk in _iter_chunks(upload):
+        *done, buf = PARAGRAPH_RE.split(buf + chunk)
+        yield from done
+        while len(buf) > MAX_BLOCK:
+            cut = buf.rfind("\n", 0, MAX_BLOCK) + 1 or MAX_BLOCK
+            yield buf[:cut]
+            buf = buf[cut:]
+    yield buf
+
+
+MD_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+MD_SETEXT_RE = re.compile(r"^\s*(=+|-+)\s*$")
+MD_PREFIX_RE = re.compile(r"^\s*(?:>\s*)*(?:[-*+]\s+|\d+[.)]\s+)?")
+MD_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MD_MARKUP_RE = re.compile(r"`+|~~|<[^>]+>|(?<!\w)[*_]{1,3}|[*_]{1,3}(?!\w)")
+
+
+@register(MARKDOWN, ".md", ".markdown")
+def iter_markdown(upload):
+    """Paragraphs with code blocks dropped and inline markup stripped."""
+    in_code = False
+    for para in iter_text(upload):
+        lines = []
+        for line in para.splitlines():
+            if MD_FENCE_RE.match(line):
+                in_code = not in_code
+            elif in_code:
+                continue
+            elif MD_SETEXT_RE.match(line):
+                if lines:  # "Title\n=====" is a heading; a lone "---" is a rule
+                    lines[-1] = f"# {lines[-1]}"
+            elif line.lstrip().startswith("#"):
+                lines.append(MD_MARKUP_RE.sub("", MD_LINK_RE.sub(r"\1", line.strip())))
+            else:
+                line = MD_PREFIX_RE.sub("", line, count=1)
+                lines.append(MD_MARKUP_RE.sub("", MD_LINK_RE.sub(r"\1", line)))
+        yield "\n".join(lines)
+
+
+class _HTMLBlocks(HTMLParser):
+    """Collects the text of block-level elements as they close."""
+
+    BLOCK_TAGS = {
+        "p", "div", "section", "article", "main", "header", "footer", "aside", "nav",
+        "li", "ul", "ol", "dl", "dt", "dd", "table", "tr", "td", "th",
+        "pre", "blockquote", "figure", "figcaption", "br", "hr",
+    }
+    HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+    SKIP_TAGS = {"script", "style", "noscript", "template", "title", "svg"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._text, self._size = [], 0
+        self._skip = 0
+        self._heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.HEADING_TAGS or tag in self.BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in self.HEADING_TAGS
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.HEADING_TAGS or tag in self.BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._text.append(data)
+            self._size += len(data)
+            if self._size > MAX_BLOCK:
+                self._flush()
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        if text:
+            self.blocks.append(f"# {text}" if self._heading else text)
+        self._text, self._size = [], 0
+        self._heading = False
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+@register(HTML, ".html", ".htm")
+def iter_html(upload):
+    """Text of block elements, headings as `# ` lines; scripts and styles skipped."""
+    parser = _HTMLBlocks()
+    for chunk in _iter_chunks(upload):
+        parser.feed(chunk)
+        yield from parser.blocks
+        parser.blocks.clear()
+    parser.close()
+    yield from parser.blocks
+
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+@register(DOCX, ".docx")
+def iter_docx(upload):
+    """Paragraphs from word/document.xml, parsed incrementally; heading styles become `# ` lines."""
+    with zipfile.ZipFile(upload) as z, z.open("word/document.xml") as xml:
+        for _, elem in ET.iterparse(xml):
+            if elem.tag != W + "p":
+                continue
+            text = "".join(
+                (node.text or "") if node.tag == W + "t" else " "
+                for node in elem.iter() if node.tag in (W + "t", W + "tab", W + "br")
+            )
+            style = elem.find(f"{W}pPr/{W}pStyle")
+            name = (style.get(W + "val", "") if style is not None else "").lower()
+            if text.strip() and (name.startswith(("heading", "title"))
+                                 or elem.find(f"{W}pPr/{W}outlineLvl") is not None):
+                text = f"# {text}"
+            elem.clear()  # Drop the parsed runs; only one paragraph is held at a time
+            yield text
+
+
+register(PDF, ".pdf")(iter_pdf_pages)
+
+
+# --------------------------- PIPELINE --------------------------- #
+HEADING_MARK_RE = re.compile(r"^[ \t]*#+[ \t]*", re.M)
+
+
+def plain_text(block):
+    """A block with its `# ` heading markers removed, for saving and prompts."""
+    return HEADING_MARK_RE.sub("", block)
+
+
+def _block_hash(block):
+    return hashlib.blake2b(" ".join(block.split()).encode("utf-8"), digest_size=16).digest()
+
+
+def iter_blocks(upload, mime, stats=None):
+    """Non-empty blocks from `upload`, skipping repeats of earlier blocks.
+
+    A repeated block is kept if it contains a heading, so sections that
+    reuse a heading ("Summary", "Exercises") still start a new section.
+    """
+    stats = {} if stats is None else stats
+    stats.setdefault("blocks", 0)
+    stats.setdefault("duplicates", 0)
+    seen = set()
+    for block in EXTRACTORS[mime](upload):
+        if not block.strip():
+            continue
+        digest = _block_hash(block)
+        if digest in seen and not any(looks_like_heading(line.strip()) for line in block.splitlines()):
+            stats["duplicates"] += 1
+            continue
+        seen.add(digest)
+        stats["blocks"] += 1
+        yield block
+
+
+def upload_digest(upload):
+    """Content hash of a binary file, read in chunks; leaves the position at 0."""
+    upload.seek(0)
+    h = hashlib.blake2b(digest_size=16)
+    while chunk := upload.read(1024 * 1024):
+        h.update(chunk)
+    upload.seek(0)
+    return h.hexdigest()
+
+
+def ingest(upload, name=None, mime=None):
+    """Extract and index a syllabus in one streaming pass.
+
+    Returns (text, index, stats): the extracted text without heading
+    markers, the sentence index DataFrame from the segmenter and
+    {"blocks", "duplicates"} counts. Extraction and indexing stream, but the
+    returned text is the whole (deduplicated) document, so it is held in
+    memory until the caller saves it.
+    Raises ValueError for unsupported types; extractor errors propagate.
+    """
+    mime = resolve_mime(name or getattr(upload, "name", None), mime or getattr(upload, "type", None))
+    upload.seek(0)
+    stats, pieces = {}, []
+
+    def lines():
+        for block in iter_blocks(upload, mime, stats):
+            pieces.append(plain_text(block))
+            yield from block.splitlines()
+
+    index = index_sections(iter_sections(lines()))
+    return "\n\n".join(pieces).strip(), index, stats
+
+
+def extract_text(path):
+    """Text of a syllabus file in any registered format, without heading markers."""
+    with open(path, "rb") as f:
+        return "\n\n".join(map(plain_text, iter_blocks(f, resolve_mime(path)))).strip()
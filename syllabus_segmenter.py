@@ -0,0 +1,221 @@
+"""
+Offline topic segmentation for NovaLearn syllabi.
+
+Splits extracted syllabus text into sections and labels every sentence with
+its section, producing the syllabus index used for per-topic generation,
+quiz filtering and accuracy charts.
+
+Sections come from headings when they can be found: in PDFs, lines set in a
+noticeably larger font than the body text (marked as `# ` lines by
+`iter_pdf_pages`); otherwise lines that look like headings ("Unit 3: ...",
+"2.1 Cell Biology", "# Markdown", short ALL CAPS lines). When fewer than two
+headings are found, sentences are clustered with a vectorized TF-IDF +
+k-means pass and each cluster is named after its top terms.
+"""
+
+import re
+from collections import defaultdict
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from PyPDF2 import PdfReader
+
+from novalearn_core import STOPWORDS, clean_text_for_sentences, prepare_text
+
+HEADING_SIZE_RATIO = 1.15  # heading font must be this much larger than body text
+MAX_HEADING_WORDS = 12
+MAX_FEATURES = 500
+MAX_CLUSTERS = 8
+INDEX_COLS = ["sentence_id", "topic", "sentence"]
+
+HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S"
+    r"|(?:chapter|unit|module|week|lecture|part|section|topic)\s+[\dIVXLC]+\b"
+    r"|\d+(?:\.\d+)*\.?\s+[A-Z])",
+    re.IGNORECASE,
+)
+TOKEN_RE = re.compile(r"[a-z][a-z\-]{2,}")
+
+
+# ---------------------- HEADING DETECTION ----------------------- #
+def _page_fragments(page):
+    """A page's extracted text plus its (y, fragment, font size) pieces."""
+    fragments = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if text.strip():
+            scale = abs(tm[3] or tm[0] or 1) * abs(cm[3] or cm[0] or 1)
+            y = round(cm[5] + tm[5] * (cm[3] or 1))
+            fragments.append((y, text, float(font_size or 0) * scale))
+
+    return page.extract_text(visitor_text=visit) or "", fragments
+
+
+def _count_chars(chars, fragments):
+    for _, frag, size in fragments:
+        chars[round(size, 1)] += len(frag.strip())
+
+
+def _heading_lines(fragments, body):
+    lines = defaultdict(lambda: ["", 0.0])
+    for y, frag, size in fragments:
+        line = lines[y]
+        line[0] += frag
+        line[1] = max(line[1], size)
+    return {
+        _norm(t) for t, size in lines.values()
+        if size >= body * HEADING_SIZE_RATIO and 0 < len(t.split()) <= MAX_HEADING_WORDS
+    }
+
+
+def iter_pdf_pages(upload):
+    """Yield PDF text one page at a time with heading lines marked as `# ` lines.
+
+    The body font size is the most common size over the pages read so far,
+    so only one page's layout data is held at a time.
+    """
+    chars = defaultdict(int)
+    for page in PdfReader(upload).pages:
+        text, frags = _page_fragments(page)
+        _count_chars(chars, frags)
+        headings = _heading_lines(frags, max(chars, key=chars.get)) if chars else set()
+        yield "\n".join(f"# {line}" if _norm(line) in headings else line for line in text.splitlines())
+
+
+def _norm(line):
+    return re.sub(r"\s+", " ", line).strip()
+
+
+def looks_like_heading(line):
+    words = line.split()
+    if not words or len(words) > MAX_HEADING_WORDS or line.endswith((".", ",", ";")):
+        return False
+    if HEADING_RE.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and all(c.isupper() for c in letters)
+
+
+def clean_heading(line):
+    return re.sub(r"^#+\s*", "", line).strip(" :-")
+
+
+def iter_sections(lines, headings=None):
+    """Yield (heading, body) sections from an iterable of lines.
+
+    Only the section being read is held in memory, so `lines` can be a
+    stream. Headings are the lines in `headings`, or heading-like lines.
+    """
+    current, body = None, []
+    for raw in lines:
+        line = _norm(raw)
+        if not line:
+            continue
+        is_heading = line in headings if headings else looks_like_heading(line)
+        if is_heading:
+            if body:
+                yield current or "Introduction", " ".join(body)
+            current, body = clean_heading(line), []
+        else:
+            body.append(line)
+    if body:
+        yield current or "Introduction", " ".join(body)
+
+
+def segment_by_headings(text, headings=None):
+    """Split text into [(heading, body)] using layout headings or text patterns."""
+    return list(iter_sections(text.splitlines(), headings))
+
+
+# ---------------------- TF-IDF + K-MEANS ------------------------ #
+def tfidf_matrix(sentences, max_features=MAX_FEATURES):
+    """L2-normalized TF-IDF rows (float32) and the vocabulary."""
+    docs = [[t for t in TOKEN_RE.findall(s.lower()) if t not in STOPWORDS] for s in sentences]
+    df = defaultdict(int)
+    for toks in docs:
+        for t in set(toks):
+            df[t] += 1
+    vocab = sorted(df, key=lambda t: (-df[t], t))[:max_features]
+    index = {t: i for i, t in enumerate(vocab)}
+
+    rows, cols = [], []
+    for r, toks in enumerate(docs):
+        for t in toks:
+            if t in index:
+                rows.append(r)
+                cols.append(index[t])
+    tf = np.zeros((len(sentences), len(vocab)), dtype=np.float32)
+    np.add.at(tf, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+
+    n = len(sentences)
+    idf = np.log((1 + n) / (1 + np.array([df[t] for t in vocab], dtype=np.float32))) + 1
+    x = tf * idf
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.where(norms == 0, 1, norms), vocab
+
+
+def kmeans(x, k, iters=25, seed=0):
+    """Spherical k-means (cosine similarity) with k-means++ seeding."""
+    rng = np.random.default_rng(seed)
+    centers = [x[rng.integers(len(x))]]
+    for _ in range(1, k):
+        dist = 1 - np.max(x @ np.array(centers).T, axis=1)
+        dist = np.clip(dist, 0, None)
+        total = dist.sum()
+        centers.append(x[rng.choice(len(x), p=dist / total)] if total > 0 else x[rng.integers(len(x))])
+    centers = np.array(centers)
+
+    labels = np.zeros(len(x), dtype=int)
+    for i in range(iters):
+        new_labels = np.argmax(x @ centers.T, axis=1)
+        if i and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(k):
+            members = x[labels == c]
+            if len(members):
+                center = members.sum(axis=0)
+                centers[c] = center / (np.linalg.norm(center) or 1)
+    return labels, centers
+
+
+def cluster_topics(sentences, k=None):
+    """Label each sentence with a k-means cluster named after its top terms."""
+    if len(sentences) < 4:
+        return ["General"] * len(sentences)
+    x, vocab = tfidf_matrix(sentences)
+    if not vocab:
+        return ["General"] * len(sentences)
+    k = k or max(2, min(MAX_CLUSTERS, int(np.sqrt(len(sentences) / 2))))
+    labels, centers = kmeans(x, min(k, len(sentences)))
+    names = {}
+    for c in np.unique(labels):
+        top = np.argsort(-centers[c])[:2]
+        base = " / ".join(vocab[i].title() for i in top if centers[c][i] > 0) or f"Topic {c + 1}"
+        names[c] = base if base not in names.values() else f"{base} ({c + 1})"
+    return [names[c] for c in labels]
+
+
+# ------------------------ SYLLABUS INDEX ------------------------ #
+def index_sections(sections):
+    """DataFrame with one row per sentence: sentence_id, topic, sentence.
+
+    Consumes `sections` lazily. With fewer than two sections the sentences
+    are clustered into topics instead.
+    """
+    sections = iter(sections)
+    head = [s for s in (next(sections, None), next(sections, None)) if s]
+    if len(head) >= 2:
+        rows = [(topic, s) for topic, body in chain(head, sections) for s in clean_text_for_sentences(prepare_text(body))]
+    else:
+        sents = clean_text_for_sentences(prepare_text(" ".join(body for _, body in head)))
+        rows = list(zip(cluster_topics(sents), sents))
+    return pd.DataFrame(
+        [(i, topic, s) for i, (topic, s) in enumerate(rows, 1)], columns=INDEX_COLS
+    )
+
+
+def build_syllabus_index(text, headings=None):
+    """DataFrame with one row per sentence: sentence_id, topic, sentence."""
+    return index_sections(iter_sections(text.splitlines(), headings))
@@ -0,0 +1,229 @@
+"""
+Streaming export and import of to-do tasks.
+
+Exports read the task store in batches and write encoded chunks to a
+temporary file, so the payload is only built when a download is requested
+and building it keeps memory flat regardless of how many tasks exist.
+Streamlit's download button then reads that file into memory to serve it,
+so the finished payload itself is buffered once per download. Imports parse CSV, JSON, JSON Lines or
+Parquet incrementally, validate each record and insert in batches, skipping
+tasks that already exist (same name and due time).
+
+Parquet support needs the optional `pyarrow` package.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+
+from task_store import format_due, parse_due
+from recurrence import check_rule
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is optional
+    pa = pq = None
+
+FORMATS = {
+    "CSV": {"ext": "csv", "mime": "text/csv"},
+    "JSON": {"ext": "json", "mime": "application/json"},
+    "JSON Lines": {"ext": "jsonl", "mime": "application/x-ndjson"},
+    "Parquet": {"ext": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+FIELDS = ["id", "task", "due", "status", "recur"]
+STATUSES = {"pending", "completed"}
+BATCH_SIZE = 5000
+
+
+def available_formats():
+    return [f for f in FORMATS if f != "Parquet" or pq is not None]
+
+
+# ---------------- Export ---------------- #
+def _records(store, batch_size):
+    for batch in store.iter_batches(batch_size):
+        yield [
+            {"id": t["id"], "task": t["task"], "due": format_due(t["due_ts"]),
+             "status": t["status"], "recur": t["recur"] or ""}
+            for t in batch
+        ]
+
+
+def iter_export(store, fmt, batch_size=BATCH_SIZE):
+    """Yield the export as encoded byte chunks, one store batch at a time."""
+    if fmt == "CSV":
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=FIELDS)
+        writer.writeheader()
+        for records in _records(store, batch_size):
+            writer.writerows(records)
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode("utf-8")
+    elif fmt == "JSON Lines":
+        for records in _records(store, batch_size):
+            yield "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+    elif fmt == "JSON":
+        first = True
+        yield b"["
+        for records in _records(store, batch_size):
+            parts = ",\n".join(json.dumps(r, indent=4) for r in records)
+            yield (("\n" if first else ",\n") + parts).encode("utf-8")
+            first = False
+        yield b"\n]"
+    else:
+        raise ValueError(f"Unsupported streaming format: {fmt}")
+
+
+def export_to_file(store, fmt, batch_size=BATCH_SIZE):
+    """Write the export to a temporary file and return it rewound.
+
+    The file is unbuffered (a raw file object), which is what
+    `st.download_button` accepts for file-like data.
+    """
+    out = tempfile.TemporaryFile(buffering=0)
+    if fmt == "Parquet":
+        if pq is None:
+            raise ImportError("Parquet export requires pyarrow")
+        schema = pa.schema([(f, pa.int64() if f == "id" else pa.string()) for f in FIELDS])
+        with pq.ParquetWriter(out, schema) as writer:
+            for records in _records(store, batch_size):
+                writer.write_batch(pa.RecordBatch.from_pylist(records, schema=schema))
+    else:
+        for chunk in iter_export(store, fmt, batch_size):
+            out.write(chunk)
+    out.seek(0)
+    return out
+
+
+# ---------------- Import ---------------- #
+def _iter_json_array(text_stream, chunk_size=1 << 16):
+    """Incrementally decode the objects of a top-level JSON array.
+
+    Raises ValueError on malformed input or when the file ends before the
+    closing `]`, without reading past the bad element.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, offset, started, eof = "", 0, 0, False, False
+    while not eof:
+        chunk = text_stream.read(chunk_size)
+        eof = not chunk
+        offset += pos
+        buf = buf[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("JSON import expects a top-level array")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # Only an element cut off by the chunk boundary is worth
+                # reading more for: an unterminated string, or an error within
+                # a literal's length of the end. Anything else is malformed.
+                if not eof and (e.msg.startswith("Unterminated string") or len(buf) - e.pos <= 9):
+                    break
+                raise ValueError(f"Malformed JSON at character {offset + e.pos}: {e.msg}") from None
+            yield obj
+    raise ValueError("Truncated JSON array: missing closing ']'" if started else "JSON import expects a top-level array")
+
+
+def iter_records(fileobj, fmt):
+    """Yield raw task dicts from an uploaded file without loading it whole."""
+    if fmt == "Parquet":
+        if pq is None:
+            raise ImportError("Parquet import requires pyarrow")
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=BATCH_SIZE):
+            yield from batch.to_pylist()
+        return
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    try:
+        if fmt == "CSV":
+            yield from csv.DictReader(text)
+        elif fmt == "JSON Lines":
+            for line in text:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield {"_error": f"invalid JSON ({e.msg})"}
+        elif fmt == "JSON":
+            yield from _iter_json_array(text)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+    finally:
+        text.detach()  # Leave the caller's file open
+
+
+def validate_record(rec):
+    """Return a (task, due_ts, status, recur) row, or raise ValueError."""
+    if "_error" in rec:
+        raise ValueError(rec["_error"])
+    task = str(rec.get("task") or "").strip()
+    if not task:
+        raise ValueError("missing task name")
+    due = rec.get("due")
+    if due in (None, ""):
+        due_ts = None
+    elif isinstance(due, (int, float)):
+        due_ts = int(due)
+    else:
+        try:
+            due_ts = parse_due(due)
+        except ValueError:
+            due_ts = int(datetime.fromisoformat(due).timestamp())
+    status = (rec.get("status") or "pending").strip().lower()
+    if status not in STATUSES:
+        raise ValueError(f"invalid status {status!r}")
+    recur = (rec.get("recur") or "").strip() or None
+    if recur:
+        check_rule(recur)
+    return task, due_ts, status, recur
+
+
+def import_tasks(store, fileobj, fmt, batch_size=BATCH_SIZE):
+    """Stream-import tasks; returns counts of imported, duplicate and invalid rows.
+
+    Batches are committed as they fill, so a file that turns out to be
+    malformed part-way through keeps the rows read before the error: the
+    parse error is returned as stats["failed"] rather than raised.
+    """
+    stats = {"imported": 0, "duplicates": 0, "invalid": 0, "errors": [], "failed": None}
+    batch = []
+    try:
+        for n, rec in enumerate(iter_records(fileobj, fmt), 1):
+            try:
+                batch.append(validate_record(rec))
+            except (ValueError, TypeError, AttributeError) as e:
+                stats["invalid"] += 1
+                if len(stats["errors"]) < 20:  # Keep a sample, not every bad row
+                    stats["errors"].append(f"row {n}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                _flush(store, batch, stats)
+                batch = []
+    except ValueError as e:
+        stats["failed"] = str(e)
+    if batch:
+        _flush(store, batch, stats)
+    return stats
+
+
+def _flush(store, batch, stats):
+    inserted = store.insert_new(batch)
+    stats["imported"] += inserted
+    stats["duplicates"] += len(batch) - inserted
+
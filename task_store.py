@@ -0,0 +1,364 @@
+"""
+SQLite-backed task store for the To-Do List app.
+
+Every task has a stable integer id, and each interaction updates a single
+record inside its own transaction instead of rewriting the whole task file.
+Due dates are stored as Unix timestamps, and a composite index on
+`(status, due_ts)` keeps pending tasks in deadline order so views can be
+paged and filtered without parsing or sorting in Python. Recurring tasks
+keep a single row holding their next due date, and bulk actions apply to
+many ids in one transaction. Batched reads and de-duplicating inserts
+back the streaming export/import in `task_io`. Change listeners let the
+reminder scheduler follow writes without polling. Existing `tasks.json`
+files are imported on first use.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from recurrence import advance
+
+TASK_DB = "tasks.db"
+TASK_FILE = "tasks.json"  # Legacy whole-file storage, imported once
+DUE_FORMAT = "%Y-%m-%d %H:%M"
+
+WINDOWS = ["All", "Overdue", "Today", "This week"]
+
+SCHEMA_VERSION = 4
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS tasks (
+        id     INTEGER PRIMARY KEY AUTOINCREMENT,
+        task   TEXT NOT NULL,
+        due_ts INTEGER,
+        status TEXT NOT NULL DEFAULT 'pending',
+        recur  TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_task_due ON tasks(task, due_ts)",  # Import de-duplication
+]
+
+
+def parse_due(due_str):
+    """Convert a legacy 'YYYY-MM-DD HH:MM' string to a timestamp (None if blank)."""
+    if not due_str:
+        return None
+    return int(datetime.strptime(due_str, DUE_FORMAT).timestamp())
+
+
+def format_due(due_ts):
+    return datetime.fromtimestamp(due_ts).strftime(DUE_FORMAT) if due_ts is not None else ""
+
+
+def window_bounds(window, now=None):
+    """Return (start_ts, end_ts) for a due-date filter; either side may be None."""
+    now = now or datetime.now()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "Overdue":
+        return None, int(now.timestamp())
+    if window == "Today":
+        return int(midnight.timestamp()), int((midnight + timedelta(days=1)).timestamp())
+    if window == "This week":
+        week_start = midnight - timedelta(days=midnight.weekday())
+        return int(week_start.timestamp()), int((week_start + timedelta(weeks=1)).timestamp())
+    return None, None
+
+
+class TaskStore:
+    """Task persistence with atomic single-record updates."""
+
+    def __init__(self, path=TASK_DB, legacy_file=TASK_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._listeners = []
+        # Streamlit reruns scripts on different threads; access is serialized by _lock.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._enable_wal()
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate(legacy_file)
+
+    def _enable_wal(self, attempts=50):
+        # Switching a fresh database to WAL needs an exclusive lock and does
+        # not wait on the busy timeout, so retry while another process holds it.
+        for attempt in range(attempts):
+            try:
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                return
+            except sqlite3.OperationalError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.1)
+
+    # ---------------- Schema ---------------- #
+    def _migrate(self, legacy_file):
+        with self._lock, self.conn:
+            # Take the write lock before reading the version, so when several
+            # processes open a fresh database only the first one migrates (and
+            # imports the legacy file); the rest see the new version and stop.
+            # One transaction also means a crash cannot half-migrate.
+            self.conn.execute("BEGIN IMMEDIATE")
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            if version == 1:
+                # v1 stored due dates as strings; rebuild the table with timestamps.
+                rows = self.conn.execute("SELECT id, task, due, status FROM tasks").fetchall()
+                self.conn.execute("DROP TABLE tasks")
+                for stmt in SCHEMA:
+                    self.conn.execute(stmt)
+                self.conn.executemany(
+                    "INSERT INTO tasks (id, task, due_ts, status) VALUES (?, ?, ?, ?)",
+                    [(r["id"], r["task"], parse_due(r["due"]), r["status"]) for r in rows],
+                )
+            elif version in (2, 3):
+                if version == 2:
+                    self.conn.execute("ALTER TABLE tasks ADD COLUMN recur TEXT")
+                for stmt in SCHEMA[1:]:
+                    self.conn.execute(stmt)
+            else:
+                for stmt in SCHEMA:
+                    self.conn.execute(stmt)
+                if legacy_file and os.path.exists(legacy_file):
+                    self._import_legacy(legacy_file)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _import_legacy(self, legacy_file):
+        try:
+            with open(legacy_file, "r") as f:
+                tasks = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        self.conn.executemany(
+            "INSERT INTO tasks (task, due_ts, status) VALUES (?, ?, ?)",
+            [(t["task"], parse_due(t.get("due")), t.get("status", "pending")) for t in tasks if t.get("task")],
+        )
+
+    # ---------------- Listeners ---------------- #
+    def on_change(self, callback):
+        """Call `callback(ids)` after every write.
+
+        `ids` lists the tasks that changed, or is None when the store was
+        cleared.
+        """
+        self._listeners.append(callback)
+
+    def _changed(self, ids):
+        # Called after the write lock is released so listeners may read back.
+        for callback in self._listeners:
+            callback(ids)
+
+    # ---------------- Reads ---------------- #
+    def get(self, task_id):
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_many(self, task_ids):
+        rows = []
+        with self._lock:
+            for start in range(0, len(task_ids), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = task_ids[start:start + 500]
+                rows += self.conn.execute(
+                    f"SELECT * FROM tasks WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+        return [dict(r) for r in rows]
+
+    @staticmethod
+    def _window_clause(window):
+        start, end = window_bounds(window)
+        clause, params = "", []
+        if start is not None:
+            clause += " AND due_ts >= ?"
+            params.append(start)
+        if end is not None:
+            clause += " AND due_ts < ?"
+            params.append(end)
+        return clause, params
+
+    def by_status(self, status, window="All", limit=-1, offset=0):
+        """Tasks with the given status in due order, optionally filtered and paged.
+
+        Served straight from the (status, due_ts) index, so a page costs the
+        same regardless of how many tasks are stored.
+        """
+        clause, params = self._window_clause(window)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM tasks WHERE status = ?{clause} ORDER BY due_ts, id LIMIT ? OFFSET ?",
+                [status, *params, limit, offset],
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def ids(self, status, window="All"):
+        """Ids of every task matching a status/window, for bulk actions."""
+        clause, params = self._window_clause(window)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id FROM tasks WHERE status = ?{clause} ORDER BY due_ts, id", [status, *params]
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def due_after(self, ts):
+        """(id, task, due_ts) of pending tasks due after `ts`, in due order."""
+        with self._lock:
+            return [tuple(r) for r in self.conn.execute(
+                "SELECT id, task, due_ts FROM tasks WHERE status = 'pending' AND due_ts > ? ORDER BY due_ts, id",
+                (ts,),
+            )]
+
+    def recurring(self):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM tasks WHERE status = 'pending' AND recur IS NOT NULL ORDER BY due_ts"
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def iter_batches(self, batch_size=5000):
+        """Yield all tasks in id order, `batch_size` rows at a time.
+
+        Uses its own read connection so a long export never holds the
+        write lock; WAL mode lets it read a consistent snapshot meanwhile.
+        """
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cur = conn.execute("SELECT * FROM tasks ORDER BY id")
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(r) for r in rows]
+        finally:
+            conn.close()
+
+    def all(self):
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM tasks ORDER BY id").fetchall()
+        return [dict(r) for r in rows]
+
+    def count(self, status=None, window="All"):
+        if status is None:
+            with self._lock:
+                return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        clause, params = self._window_clause(window)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE status = ?{clause}", [status, *params]
+            ).fetchone()[0]
+
+    # ---------------- Writes ---------------- #
+    def add(self, task, due, status="pending", recur=None):
+        """Insert a task; `due` is a datetime or a timestamp."""
+        due_ts = int(due.timestamp()) if isinstance(due, datetime) else due
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO tasks (task, due_ts, status, recur) VALUES (?, ?, ?, ?)",
+                (task, due_ts, status, recur),
+            )
+        self._changed([cur.lastrowid])
+        return cur.lastrowid
+
+    def insert_new(self, rows):
+        """Insert (task, due_ts, status, recur) rows unless the same task and due
+        time already exist; returns how many were inserted."""
+        with self._lock, self.conn:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+            cur = self.conn.executemany(
+                "INSERT INTO tasks (task, due_ts, status, recur) SELECT ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM tasks WHERE task = ? AND due_ts IS ?)",
+                [(t, d, s, r, t, d) for t, d, s, r in rows],
+            )
+            # AUTOINCREMENT ids only grow, so the new rows are the ones past last_id.
+            new_ids = [r[0] for r in self.conn.execute("SELECT id FROM tasks WHERE id > ?", (last_id,))]
+        if new_ids:
+            self._changed(new_ids)
+        return cur.rowcount
+
+    def set_status(self, task_id, status):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id))
+        self._changed([task_id])
+
+    def complete(self, task_id):
+        self.bulk_complete([task_id])
+
+    def snooze(self, task_id, delta):
+        """Push a task's due date back by a timedelta."""
+        self.bulk_snooze([task_id], delta)
+
+    def delete(self, task_id):
+        self.bulk_delete([task_id])
+
+    # ---------------- Bulk Writes ---------------- #
+    # Each bulk action is one transaction, however many ids it touches.
+    def bulk_complete(self, task_ids, now=None):
+        """Complete tasks; recurring ones log a completed instance and advance."""
+        now = now or datetime.now()
+        with self._lock, self.conn:
+            series = []
+            for start in range(0, len(task_ids), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = task_ids[start:start + 500]
+                series += self.conn.execute(
+                    f"SELECT id, task, due_ts, recur FROM tasks "
+                    f"WHERE id IN ({','.join('?' * len(chunk))}) AND recur IS NOT NULL",
+                    chunk,
+                ).fetchall()
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'completed' WHERE id = ? AND recur IS NULL",
+                [(i,) for i in task_ids],
+            )
+            next_due = [(r, self._next_due_ts(r, now)) for r in series]
+            # A series whose rule no longer fires ends here: complete it in place.
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'completed' WHERE id = ?",
+                [(r["id"],) for r, ts in next_due if ts is None],
+            )
+            self.conn.executemany(
+                "INSERT INTO tasks (task, due_ts, status) VALUES (?, ?, 'completed')",
+                [(r["task"], r["due_ts"]) for r, ts in next_due if ts is not None],
+            )
+            self.conn.executemany(
+                "UPDATE tasks SET due_ts = ? WHERE id = ?",
+                [(ts, r["id"]) for r, ts in next_due if ts is not None],
+            )
+        self._changed(list(task_ids))
+
+    @staticmethod
+    def _next_due_ts(row, now):
+        """Next due timestamp of a series, or None if its rule never fires again."""
+        due = datetime.fromtimestamp(row["due_ts"]) if row["due_ts"] is not None else now
+        try:
+            return int(advance(row["recur"], due, now).timestamp())
+        except ValueError:
+            return None
+
+    def bulk_snooze(self, task_ids, delta):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE tasks SET due_ts = due_ts + ? WHERE id = ? AND due_ts IS NOT NULL",
+                [(int(delta.total_seconds()), i) for i in task_ids],
+            )
+        self._changed(list(task_ids))
+
+    def bulk_reschedule(self, task_ids, due):
+        due_ts = int(due.timestamp()) if isinstance(due, datetime) else due
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE tasks SET due_ts = ? WHERE id = ?", [(due_ts, i) for i in task_ids])
+        self._changed(list(task_ids))
+
+    def bulk_delete(self, task_ids):
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in task_ids])
+        self._changed(list(task_ids))
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM tasks")
+        self._changed(None)
+
+    def close(self):
+        self.conn.close()
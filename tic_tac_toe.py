@@ -3,6 +3,8 @@ import json
 import os
 import math
 
+from shared_cache import cached_json
+
 LEADERBOARD_FILE = "leaderboard.json"
 
 # ---------------- Leaderboard Helpers ---------------- #
@@ -46,7 +48,9 @@ def check_winner(board, player):
 def is_full(board):
     return all(cell != " " for row in board for cell in row)
 
-def minimax(board, depth, is_maximizing):
+def minimax(board, depth, is_maximizing, stats=None):
+    if stats is not None:  # Node counter used by the self-play harness
+        stats["nodes"] = stats.get("nodes", 0) + 1
     if check_winner(board, "O"):  # Computer wins
         return 1
     if check_winner(board, "X"):  # Human wins
@@ -60,7 +64,7 @@ def minimax(board, depth, is_maximizing):
             for c in range(3):
                 if board[r][c] == " ":
                     board[r][c] = "O"
-                    score = minimax(board, depth + 1, False)
+                    score = minimax(board, depth + 1, False, stats)
                     board[r][c] = " "
                     best_score = max(score, best_score)
         return best_score
@@ -70,19 +74,63 @@ def minimax(board, depth, is_maximizing):
             for c in range(3):
                 if board[r][c] == " ":
                     board[r][c] = "X"
-                    score = minimax(board, depth + 1, True)
+                    score = minimax(board, depth + 1, True, stats)
                     board[r][c] = " "
                     best_score = min(score, best_score)
         return best_score
 
-def best_move(board):
+def board_key(board):
+    return "".join(cell for row in board for cell in row)
+
+def build_minimax_table():
+    """Minimax score of every reachable position, keyed by (board, O to move).
+
+    There are only about ten thousand positions, so solving them all once lets
+    best_move answer with lookups instead of a fresh tree search per move.
+    """
+    table = {}
+
+    def solve(board, is_maximizing):
+        key = (board_key(board), is_maximizing)
+        if key not in table:
+            if check_winner(board, "O"):
+                table[key] = 1
+            elif check_winner(board, "X"):
+                table[key] = -1
+            elif is_full(board):
+                table[key] = 0
+            else:
+                scores = []
+                for r in range(3):
+                    for c in range(3):
+                        if board[r][c] == " ":
+                            board[r][c] = "O" if is_maximizing else "X"
+                            scores.append(solve(board, not is_maximizing))
+                            board[r][c] = " "
+                table[key] = max(scores) if is_maximizing else min(scores)
+        return table[key]
+
+    empty = [[" " for _ in range(3)] for _ in range(3)]
+    solve(empty, True)
+    solve(empty, False)
+    return table
+
+@st.cache_resource(show_spinner=False)
+def load_minimax_table():
+    """Solved game table, built once per server process."""
+    return build_minimax_table()
+
+def best_move(board, stats=None, table=None):
     best_score = -math.inf
     move = None
     for r in range(3):
         for c in range(3):
             if board[r][c] == " ":
                 board[r][c] = "O"
-                score = minimax(board, 0, False)
+                if table is not None:
+                    score = table[(board_key(board), False)]
+                else:
+                    score = minimax(board, 0, False, stats)
                 board[r][c] = " "
                 if score > best_score:
                     best_score = score
@@ -167,7 +215,7 @@ def tic_tac_toe():
 
     # Computer AI move
     if mode == "Play vs Computer" and current == "O" and not st.session_state.winner:
-        move = best_move(board)
+        move = best_move(board, table=load_minimax_table())
         if move:
             r, c = move
             board[r][c] = "O"
@@ -198,7 +246,7 @@ def tic_tac_toe():
 
     # Leaderboard
     st.subheader("📊 Leaderboard")
-    leaderboard = init_leaderboard()
+    leaderboard = cached_json(LEADERBOARD_FILE, {})
     if leaderboard:
         st.table(leaderboard)
     else:
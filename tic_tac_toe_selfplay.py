@@ -0,0 +1,172 @@
+"""
+Headless self-play and benchmarking harness for the Tic-Tac-Toe engine.
+
+Plays games between the minimax AI, a random player and scripted players
+without the Streamlit UI, across a process pool, and reports engine speed
+(nodes searched per move, moves per second, latency percentiles) together
+with the outcome distribution.
+
+Usage:
+    python tic_tac_toe_selfplay.py --games 200 --x ai --o random
+    python tic_tac_toe_selfplay.py --games 50 --x script:4,0,8 --o ai
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.stats import percentile
+from tic_tac_toe import check_winner, is_full, best_move
+
+SWAP = {"X": "O", "O": "X", " ": " "}
+
+
+# ---------------- Players ---------------- #
+def empty_cells(board):
+    return [(r, c) for r in range(3) for c in range(3) if board[r][c] == " "]
+
+
+def ai_move(board, mark, stats=None):
+    """Minimax move for either mark (the engine itself always plays O)."""
+    if mark == "O":
+        return best_move(board, stats)
+    mirrored = [[SWAP[cell] for cell in row] for row in board]
+    return best_move(mirrored, stats)
+
+
+def make_player(spec, seed=None):
+    """Build a move function from a spec: 'ai', 'random' or 'script:4,0,8'.
+
+    Scripted players play their listed cells (0-8, row-major) in order,
+    skipping occupied ones, then fall back to the first free cell.
+    """
+    if spec == "ai":
+        return ai_move
+    if spec == "random":
+        rng = random.Random(seed)
+        return lambda board, mark, stats=None: rng.choice(empty_cells(board))
+    if spec.startswith("script:"):
+        script = [int(x) for x in spec[len("script:"):].split(",") if x.strip()]
+        if any(not 0 <= i <= 8 for i in script):
+            raise ValueError(f"Scripted cells must be 0-8: {spec}")
+
+        def scripted(board, mark, stats=None):
+            for i in script:
+                if board[i // 3][i % 3] == " ":
+                    return (i // 3, i % 3)
+            return empty_cells(board)[0]
+        return scripted
+    raise ValueError(f"Unknown player spec: {spec}")
+
+
+# ---------------- Game Runner ---------------- #
+def play_game(x_spec, o_spec, seed=None):
+    """Play one headless game and return its result and per-move metrics.
+
+    The result dict has 'winner' ("X", "O" or "Tie"), the move list and,
+    for every move made by an AI player, its latency and node count.
+    """
+    players = {"X": make_player(x_spec, seed), "O": make_player(o_spec, None if seed is None else seed + 1)}
+    specs = {"X": x_spec, "O": o_spec}
+    board = [[" " for _ in range(3)] for _ in range(3)]
+    current, moves, ai_moves = "X", [], []
+
+    while True:
+        stats = {"nodes": 0}
+        start = time.perf_counter()
+        r, c = players[current](board, current, stats)
+        elapsed = time.perf_counter() - start
+        if board[r][c] != " ":
+            raise RuntimeError(f"{specs[current]} played an occupied cell {(r, c)}")
+        board[r][c] = current
+        moves.append((current, r, c))
+        if specs[current] == "ai":
+            ai_moves.append({"mark": current, "latency": elapsed, "nodes": stats["nodes"]})
+
+        if check_winner(board, current):
+            winner = current
+            break
+        if is_full(board):
+            winner = "Tie"
+            break
+        current = "O" if current == "X" else "X"
+
+    return {"x": x_spec, "o": o_spec, "winner": winner, "moves": moves, "ai_moves": ai_moves}
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def run_games(x_spec, o_spec, games, workers=None, seed=0):
+    """Play `games` games across a process pool and return all results."""
+    jobs = [(x_spec, o_spec, seed + 2 * i) for i in range(games)]
+    if workers == 1:
+        return [play_game(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_play_game_args, jobs, chunksize=max(1, games // 64)))
+
+
+# ---------------- Reporting ---------------- #
+def summarize(results):
+    """Aggregate outcomes and AI move metrics over a list of game results."""
+    outcomes = Counter(r["winner"] for r in results)
+    ai_moves = [m for r in results for m in r["ai_moves"]]
+    latencies = sorted(m["latency"] for m in ai_moves)
+    nodes = [m["nodes"] for m in ai_moves]
+    total_time = sum(latencies)
+
+    # An AI player must never lose, whichever side it plays.
+    ai_losses = sum(
+        1 for r in results
+        if r["winner"] != "Tie" and r["x" if r["winner"] == "O" else "o"] == "ai"
+    )
+
+    return {
+        "games": len(results),
+        "outcomes": dict(outcomes),
+        "ai_moves": len(ai_moves),
+        "ai_losses": ai_losses,
+        "nodes_per_move": (sum(nodes) / len(nodes)) if nodes else 0.0,
+        "max_nodes_per_move": max(nodes, default=0),
+        "moves_per_sec": (len(ai_moves) / total_time) if total_time else 0.0,
+        "latency_ms": {p: percentile(latencies, p) * 1000 for p in (50, 90, 99)},
+    }
+
+
+def print_report(summary, wall_time):
+    print(f"Games played:        {summary['games']} in {wall_time:.2f}s")
+    print("Outcomes:            " + ", ".join(f"{k}={v}" for k, v in sorted(summary["outcomes"].items())))
+    print(f"AI moves:            {summary['ai_moves']}")
+    print(f"Nodes per move:      {summary['nodes_per_move']:.0f} avg, {summary['max_nodes_per_move']} max")
+    print(f"AI moves per second: {summary['moves_per_sec']:.1f}")
+    lat = summary["latency_ms"]
+    print(f"Move latency (ms):   p50={lat[50]:.2f} p90={lat[90]:.2f} p99={lat[99]:.2f}")
+    print(f"AI losses:           {summary['ai_losses']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Tic-Tac-Toe self-play benchmark")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--x", default="ai", help="X player: ai, random or script:<cells>")
+    parser.add_argument("--o", default="random", help="O player: ai, random or script:<cells>")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (1 = run inline)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for random players")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_games(args.x, args.o, args.games, args.workers, args.seed)
+    summary = summarize(results)
+    print_report(summary, time.perf_counter() - start)
+
+    if summary["ai_losses"]:
+        print("❌ The 'unbeatable' AI lost at least one game.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,46 @@
 import streamlit as st
-import json
-import os
+import heapq
 from datetime import datetime, timedelta
-import pandas as pd
+from itertools import islice
 
-TASK_FILE = "tasks.json"
+from task_store import TaskStore, TASK_DB, TASK_FILE, WINDOWS, format_due
+from recurrence import check_rule, occurrences
+from task_io import FORMATS, available_formats, export_to_file, import_tasks
+from reminders import ReminderScheduler
+
+PAGE_SIZE = 25
+REMINDER_POLL = 30  # seconds between checks for newly fired reminders (in memory, no I/O)
+REPEAT_OPTIONS = ["Does not repeat", "Daily", "Weekly", "Custom (cron)"]
+BULK_ACTIONS = ["Complete", "Snooze +1d", "Snooze +1w", "Reschedule", "Delete"]
 
 # ------------------ Helpers ------------------ #
-def load_tasks():
-    if os.path.exists(TASK_FILE):
-        try:
-            with open(TASK_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
-    return []
-
-def save_tasks(tasks):
-    with open(TASK_FILE, "w") as f:
-        json.dump(tasks, f, indent=4)
-
-def get_time_remaining(due_date_str):
-    """Return time left until due date, or expired status."""
-    if not due_date_str:
+@st.cache_resource
+def get_store(path=TASK_DB):
+    """One SQLite-backed store per server process, shared across reruns."""
+    return TaskStore(path, legacy_file=TASK_FILE)
+
+@st.cache_resource
+def get_scheduler():
+    """One background reminder thread per server process, following the shared store."""
+    return ReminderScheduler(get_store())
+
+@st.fragment(run_every=REMINDER_POLL)
+def reminder_toasts(scheduler):
+    """Toast reminders that fired since this session last looked."""
+    if "reminder_cursor" not in st.session_state:
+        st.session_state.reminder_cursor = scheduler.last_event_id  # Don't replay older ones
+    events, st.session_state.reminder_cursor = scheduler.events_since(st.session_state.reminder_cursor)
+    for e in events[-5:]:
+        st.toast(f"**{e['task']}** is due ({e['due']})", icon="⏰")
+    if len(events) > 5:
+        st.toast(f"…and {len(events) - 5} more tasks are now due.", icon="⏰")
+
+def get_time_remaining(due_ts, now=None):
+    """Return time left until a due timestamp, or expired status."""
+    if due_ts is None:
         return "No due date"
-    due_date = datetime.strptime(due_date_str, "%Y-%m-%d %H:%M")
-    now = datetime.now()
-    diff = due_date - now
+    now = now or datetime.now()
+    diff = datetime.fromtimestamp(due_ts) - now
     if diff.total_seconds() <= 0:
         return "⏰ Overdue!"
     days, seconds = diff.days, diff.seconds
@@ -34,88 +48,178 @@ def get_time_remaining(due_date_str):
     minutes = (seconds % 3600) // 60
     return f"{days}d {hours}h {minutes}m left"
 
+def _instances(task, start, until):
+    try:
+        for when in occurrences(task["recur"], start, until):
+            yield when, task["task"]
+    except ValueError:  # A stored rule that never fires has no instances to list
+        return
+
+def upcoming_occurrences(series, days=7, limit=20):
+    """Merge the instances of all recurring tasks in [now, now + days), generated lazily."""
+    now = datetime.now()
+    until = now + timedelta(days=days)
+    streams = [
+        _instances(t, max(datetime.fromtimestamp(t["due_ts"]), now), until)
+        for t in series if t["due_ts"] is not None
+    ]
+    return list(islice(heapq.merge(*streams), limit))
+
+def apply_bulk_action(store, action, ids, reschedule_to=None):
+    """Run one bulk action as a single transactional write."""
+    if action == "Complete":
+        store.bulk_complete(ids)
+    elif action == "Snooze +1d":
+        store.bulk_snooze(ids, timedelta(days=1))
+    elif action == "Snooze +1w":
+        store.bulk_snooze(ids, timedelta(weeks=1))
+    elif action == "Reschedule":
+        store.bulk_reschedule(ids, reschedule_to)
+    elif action == "Delete":
+        store.bulk_delete(ids)
+
 # ------------------ App ------------------ #
 def todo_list():
     st.set_page_config(page_title="Advanced To-Do List", page_icon="📝")
     st.title("📝 Advanced To-Do List")
     st.markdown("Manage tasks with **due dates, completion tracking, snooze options, and export**.")
 
-    tasks = load_tasks()
+    store = get_store()
+    reminder_toasts(get_scheduler())
 
     # ---------------- Add Task ---------------- #
     with st.expander("➕ Add a New Task"):
         new_task = st.text_input("Task name:")
         due_date = st.date_input("Due date:")
         due_time = st.time_input("Due time:")
+        repeat = st.selectbox("Repeat:", REPEAT_OPTIONS)
+        cron = ""
+        if repeat == "Custom (cron)":
+            cron = st.text_input("Cron rule (minute hour day month weekday):", "0 9 * * 1-5")
         if st.button("Add Task", type="primary"):
-            if new_task.strip():
-                due_datetime = datetime.combine(due_date, due_time).strftime("%Y-%m-%d %H:%M")
-                tasks.append({"task": new_task.strip(), "due": due_datetime, "status": "pending"})
-                save_tasks(tasks)
-                st.success("✅ Task added successfully!")
-                st.rerun()
+            recur = {"Daily": "daily", "Weekly": "weekly", "Custom (cron)": cron.strip()}.get(repeat)
+            try:
+                if recur:
+                    check_rule(recur)
+            except ValueError as e:
+                st.error(f"❌ {e}")
             else:
-                st.warning("⚠️ Task cannot be empty.")
+                if new_task.strip():
+                    store.add(new_task.strip(), datetime.combine(due_date, due_time), recur=recur)
+                    st.success("✅ Task added successfully!")
+                    st.rerun()
+                else:
+                    st.warning("⚠️ Task cannot be empty.")
 
     # ---------------- Pending Tasks ---------------- #
-    pending = [t for t in tasks if t["status"] == "pending"]
-
-    if pending:
+    if store.count("pending"):
         st.subheader("📌 Pending Tasks")
-        for i, task in enumerate(pending):
-            col1, col2, col3, col4, col5 = st.columns([3, 2, 1, 1, 1])
-            col1.write(f"**{task['task']}**")
-            col2.write(get_time_remaining(task["due"]))
+        window = st.radio("Show", WINDOWS, horizontal=True, key="pending_window")
+        total = store.count("pending", window)
+        pages = max(1, -(-total // PAGE_SIZE))
+        page = st.number_input(f"Page (of {pages})", 1, pages, 1, key="pending_page") if pages > 1 else 1
+
+        # Only the visible page is fetched and rendered, in due order from the index.
+        pending = store.by_status("pending", window, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE)
+        if not pending:
+            st.caption("No pending tasks in this window.")
+        now = datetime.now()
+        selected = []
+        for task in pending:
+            i = task["id"]  # Stable id keeps widget keys fixed across reruns
+            col0, col1, col2, col3, col4, col5 = st.columns([0.5, 3, 2, 1, 1, 1])
+            if col0.checkbox("Select", key=f"sel_{i}", label_visibility="collapsed"):
+                selected.append(i)
+            col1.write(f"**{task['task']}**" + (f" 🔁 `{task['recur']}`" if task["recur"] else ""))
+            col2.write(get_time_remaining(task["due_ts"], now))
 
             # Mark completed
             if col3.button("✅ Done", key=f"done_{i}"):
-                task["status"] = "completed"
-                save_tasks(tasks)
+                store.complete(task["id"])
                 st.success(f"Task '{task['task']}' marked as completed.")
                 st.rerun()
 
             # Snooze buttons
             if col4.button("⏰ +1d", key=f"snooze_day_{i}"):
-                due = datetime.strptime(task["due"], "%Y-%m-%d %H:%M")
-                task["due"] = (due + timedelta(days=1)).strftime("%Y-%m-%d %H:%M")
-                save_tasks(tasks)
+                store.snooze(task["id"], timedelta(days=1))
                 st.info(f"Task '{task['task']}' snoozed for 1 day.")
                 st.rerun()
 
             if col5.button("⏰ +1w", key=f"snooze_week_{i}"):
-                due = datetime.strptime(task["due"], "%Y-%m-%d %H:%M")
-                task["due"] = (due + timedelta(weeks=1)).strftime("%Y-%m-%d %H:%M")
-                save_tasks(tasks)
+                store.snooze(task["id"], timedelta(weeks=1))
                 st.info(f"Task '{task['task']}' snoozed for 1 week.")
                 st.rerun()
 
+        # ---------------- Bulk Actions ---------------- #
+        with st.expander("🧰 Bulk actions"):
+            whole_window = st.checkbox(f"Apply to all {total} tasks in this view (not just the selected ones)")
+            action = st.selectbox("Action", BULK_ACTIONS)
+            reschedule_to = None
+            if action == "Reschedule":
+                rc1, rc2 = st.columns(2)
+                reschedule_to = datetime.combine(rc1.date_input("New date:"), rc2.time_input("New time:"))
+            ids = store.ids("pending", window) if whole_window else selected
+            if st.button(f"Apply to {len(ids)} task(s)", disabled=not ids):
+                apply_bulk_action(store, action, ids, reschedule_to)
+                for i in selected:
+                    st.session_state.pop(f"sel_{i}", None)
+                st.success(f"{action} applied to {len(ids)} task(s).")
+                st.rerun()
+
     else:
         st.info("🎉 No pending tasks. You're all caught up!")
 
+    # ---------------- Recurring Tasks ---------------- #
+    series = store.recurring()
+    if series:
+        with st.expander("🔁 Upcoming occurrences (next 7 days)"):
+            upcoming = upcoming_occurrences(series)
+            for when, name in upcoming:
+                st.write(f"{when.strftime('%a %d %b %H:%M')} — {name}")
+            if not upcoming:
+                st.caption("Nothing scheduled in the next 7 days.")
+
     # ---------------- Completed Tasks ---------------- #
-    completed = [t for t in tasks if t["status"] == "completed"]
-    if completed:
-        with st.expander("✅ Completed Tasks"):
-            for t in completed:
-                st.write(f"~~{t['task']}~~ (due {t['due']})")
+    completed_total = store.count("completed")
+    if completed_total:
+        with st.expander(f"✅ Completed Tasks ({completed_total})"):
+            for t in store.by_status("completed", limit=PAGE_SIZE):
+                st.write(f"~~{t['task']}~~ (due {format_due(t['due_ts'])})")
+            if completed_total > PAGE_SIZE:
+                st.caption(f"Showing the first {PAGE_SIZE} of {completed_total}.")
 
     # ---------------- Export Tasks ---------------- #
     st.subheader("📤 Export Tasks")
-    if tasks:
-        df = pd.DataFrame(tasks)
-        csv = df.to_csv(index=False).encode("utf-8")
-        st.download_button("⬇️ Download as CSV", data=csv, file_name="tasks.csv", mime="text/csv")
-
+    if store.count():
+        fmt = st.selectbox("Format", available_formats(), key="export_format")
+        # The payload is generated in batches only when the button is clicked;
+        # Streamlit then holds the finished file in memory to serve it.
         st.download_button(
-            "⬇️ Download as JSON",
-            data=json.dumps(tasks, indent=4),
-            file_name="tasks.json",
-            mime="application/json"
+            f"⬇️ Download as {fmt}",
+            data=lambda: export_to_file(store, fmt),
+            file_name=f"tasks.{FORMATS[fmt]['ext']}",
+            mime=FORMATS[fmt]["mime"],
         )
 
+    # ---------------- Import Tasks ---------------- #
+    with st.expander("📥 Import Tasks"):
+        upload = st.file_uploader("Upload tasks", type=[FORMATS[f]["ext"] for f in available_formats()])
+        if upload and st.button("Import"):
+            fmt = next(f for f in FORMATS if upload.name.lower().endswith("." + FORMATS[f]["ext"]))
+            try:
+                stats = import_tasks(store, upload, fmt)
+            except (ValueError, ImportError) as e:
+                st.error(f"❌ Import failed: {e}")
+            else:
+                if stats["failed"]:
+                    st.error(f"❌ Import stopped early: {stats['failed']}. Rows before the error were kept.")
+                st.success(f"✅ Imported {stats['imported']} task(s); skipped {stats['duplicates']} duplicate(s).")
+                if stats["invalid"]:
+                    st.warning(f"⚠️ {stats['invalid']} invalid row(s) skipped:\n" + "\n".join(stats["errors"]))
+
     # ---------------- Clear All ---------------- #
-    if tasks and st.button("🗑️ Clear All Tasks"):
-        save_tasks([])
+    if store.count() and st.button("🗑️ Clear All Tasks"):
+        store.clear()
         st.warning("All tasks cleared.")
         st.rerun()
 